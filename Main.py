@@ -1,14 +1,79 @@
-from fastapi import FastAPI, UploadFile, File, Query
-from fastapi.responses import JSONResponse, HTMLResponse
+from fastapi import FastAPI, UploadFile, File, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, HTMLResponse, PlainTextResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-import cv2
+from contextlib import asynccontextmanager
+from typing import List
+import asyncio
+import json
 import numpy as np
-import mediapipe as mp
-import math
+import logging
 import os
+import time
+import zipfile
+import zlib
 
-app = FastAPI(title="🐶🐱 펫 닮은꼴 찾기 API", version="3.0")
+import settings
+from inference_pool import InferencePool, ImageDecodeError, FaceNotFoundError, PoolFullError
+from face_mesh_pool import checkout_face_mesh, checkout_face_detector
+from face_detection import detect_regions, crop_region, remap_landmarks
+from image_decode import decode_image
+from landmark_geometry import landmarks_to_array, analyze_landmarks, analyze_landmark_vectors, bounding_boxes, VECTOR_FEATURES
+from result_cache import create_cache, content_key
+from uploads import UploadLimitMiddleware, MULTIPART_OVERHEAD_BYTES, read_upload
+import metrics
+import feature_thresholds
+from metrics import MetricsMiddleware, StageTimer
+from precompressed import PrecompressedAsset
+import breed_images
+from breed_catalog import load_catalog
+from answer_table import AnswerTable
+from video_stream import FrameSlot, VideoSession, receive_frames
+from landmark_payload import LandmarkPayloadError, decode_json, decode_packed
+from breed_images import ImmutableStaticFiles
+
+logger = logging.getLogger("pet_face")
+
+
+# 워밍업 상태 (/health/ready에서 사용)
+warm_up_state = {"ready": False, "seconds": None, "error": None, "missing_images": []}
+
+
+def warm_up():
+    """cv2/mediapipe import, FaceMesh 그래프 생성, 더미 추론을 미리 실행"""
+    started = time.perf_counter()
+    try:
+        inference_pool.warm_up()
+    except Exception as e:
+        logger.exception("Warm-up failed")
+        warm_up_state["error"] = str(e)
+        return
+    try:
+        # 결과 카드용 썸네일 (원본이 바뀌지 않았으면 manifest만 읽고 끝남)
+        breed_catalog.set_thumbnails(breed_images.breed_thumbnails(breed_catalog.breeds.values()))
+    except Exception:
+        logger.exception("Thumbnail generation failed")
+    # 특징 조합별 응답 표를 미리 채움 (썸네일이 반영된 뒤에 계산)
+    for table in ANSWER_TABLES.values():
+        table.precompute()
+    warm_up_state["seconds"] = round(time.perf_counter() - started, 3)
+    warm_up_state["ready"] = True
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # 카탈로그에 있는 품종 이미지 파일이 하나라도 없으면 /health/ready가 실패 (결과 카드 이미지가 깨지지 않도록)
+    missing = breed_images.validate_images([
+        (pet_type, breeds, breed_images.resolve_image_path) for pet_type, breeds in breed_catalog.breeds.items()
+    ])
+    warm_up_state["missing_images"] = [image for _, _, image, _ in missing]
+    # 무거운 작업은 백그라운드에서 진행하고 포트는 바로 열어 liveness 체크에 응답
+    app.state.warm_up = asyncio.get_running_loop().run_in_executor(None, warm_up)
+    yield
+    inference_pool.shutdown()
+
+
+app = FastAPI(title="🐶🐱 펫 닮은꼴 찾기 API", version="3.0", lifespan=lifespan)
 
 # CORS 설정
 app.add_middleware(
@@ -19,303 +84,172 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 업로드 본문 크기 제한 (본문 전체를 메모리에 쌓기 전에 거부)
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+# /analyze-landmarks 본문 최대 크기 (478점 JSON도 100KB 안팎)
+MAX_LANDMARK_BODY_BYTES = 1024 * 1024
+app.add_middleware(
+    UploadLimitMiddleware,
+    limits={
+        "/analyze-face": MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES,
+        "/find_similar_dog": MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES,
+        "/analyze-landmarks": MAX_LANDMARK_BODY_BYTES,
+        "/analyze-faces/batch": settings.BATCH_MAX_BODY_BYTES,
+    }
+)
+
+# 분석 요청 지연 시간/상태 코드/동시 처리 수 기록 (크기 초과 413도 포함되도록 가장 바깥에 둠)
+app.add_middleware(MetricsMiddleware, paths=["/analyze-face", "/find_similar_dog", "/analyze-faces/batch", "/analyze-landmarks"])
+
 # 정적 파일 서빙
 if os.path.exists("dog_image"):
     app.mount("/static/dogs", StaticFiles(directory="dog_image"), name="dogs")
 if os.path.exists("cat_image"):
     app.mount("/static/cats", StaticFiles(directory="cat_image"), name="cats")
+# 썸네일은 파일명에 내용 해시가 있으므로 immutable 캐시 (폴더는 워밍업 때 생성됨)
+app.mount(
+    breed_images.THUMBNAIL_URL,
+    ImmutableStaticFiles(directory=breed_images.THUMBNAIL_DIR, check_dir=False),
+    name="thumbs",
+)
 
 # =========================
-# 강아지 데이터베이스 (파일명 수정)
+# 품종 카탈로그 (breeds.json, 프로세스당 한 번 로드)
 # =========================
-DOG_BREEDS = {
-    "골든 리트리버": {
-        "name": "골든 리트리버",
-        "description": "온순하고 친근한 성격의 대형견",
-        "face_features": {"face_width": "wide", "eye_shape": "round", "nose_size": "medium", "mouth_width": "wide", "face_length": "medium"},
-        "personality": ["친근함", "온순함", "활발함"],
-        "image": "/static/dogs/golden_retriever.png"
-    },
-    "시바견": {
-        "name": "시바견", 
-        "description": "도도하고 독립적인 성격의 일본 견종",
-        "face_features": {"face_width": "narrow", "eye_shape": "narrow", "nose_size": "small", "mouth_width": "small", "face_length": "long"},
-        "personality": ["도도함", "독립적", "영리함"],
-        "image": "/static/dogs/Shiba_Inuong.png"  # 실제 파일명과 일치
-    },
-    "푸들": {
-        "name": "푸들",
-        "description": "영리하고 우아한 성격의 곱슬모 견종", 
-        "face_features": {"face_width": "medium", "eye_shape": "oval", "nose_size": "small", "mouth_width": "small", "face_length": "long"},
-        "personality": ["영리함", "우아함", "활발함"],
-        "image": "/static/dogs/poodle.png"
-    },
-    "불독": {
-        "name": "불독",
-        "description": "묵직하고 차분한 성격의 단두종",
-        "face_features": {"face_width": "very_wide", "eye_shape": "round", "nose_size": "large", "mouth_width": "wide", "face_length": "short"},
-        "personality": ["차분함", "묵직함", "충실함"],
-        "image": "/static/dogs/bulldog.png"
-    },
-    "비글": {
-        "name": "비글",
-        "description": "호기심 많고 활발한 중형 사냥견",
-        "face_features": {"face_width": "medium", "eye_shape": "round", "nose_size": "medium", "mouth_width": "medium", "face_length": "medium"},
-        "personality": ["호기심", "활발함", "사교적"],
-        "image": "/static/dogs/beagle.png"
-    },
-    "치와와": {
-        "name": "치와와",
-        "description": "작지만 용감한 초소형 견종",
-        "face_features": {"face_width": "narrow", "eye_shape": "large", "nose_size": "very_small", "mouth_width": "small", "face_length": "short"},
-        "personality": ["용감함", "경계심", "애교"],
-        "image": "/static/dogs/chihuahua.png"
-    },
-    "허스키": {
-        "name": "시베리안 허스키",
-        "description": "늑대 같은 외모의 활동적인 견종",
-        "face_features": {"face_width": "medium", "eye_shape": "narrow", "nose_size": "medium", "mouth_width": "medium", "face_length": "long"},
-        "personality": ["활동적", "독립적", "친근함"],
-        "image": "/static/dogs/Siberian_Husky.png"
-    },
-    "라브라도": {
-        "name": "라브라도 리트리버",
-        "description": "충실하고 온화한 대형 가정견",
-        "face_features": {"face_width": "wide", "eye_shape": "round", "nose_size": "large", "mouth_width": "wide", "face_length": "medium"},
-        "personality": ["충실함", "온화함", "사교적"],
-        "image": "/static/dogs/Labrador_Retriever.png"
-    }
-}
+breed_catalog = load_catalog(settings.BREED_CATALOG_PATH)
+DOG_BREEDS = breed_catalog.breeds["dog"]
+CAT_BREEDS = breed_catalog.breeds["cat"]
+FEATURE_SCORES = breed_catalog.feature_scores
+BREED_MATRICES = breed_catalog.matrices
 
 # =========================
-# 고양이 데이터베이스
+# 추론 워커 풀 (워커마다 미리 만들어 둔 FaceMesh 그래프를 빌려 사용)
 # =========================
-CAT_BREEDS = {
-    "페르시안": {
-        "name": "페르시안",
-        "description": "긴 털과 납작한 얼굴의 고급스러운 고양이",
-        "face_features": {"face_width": "very_wide", "eye_shape": "large", "nose_size": "very_small", "mouth_width": "small", "face_length": "short"},
-        "personality": ["온순함", "고급스러움", "조용함"],
-        "image": "/static/cats/persian.png"
-    },
-    "러시안 블루": {
-        "name": "러시안 블루",
-        "description": "우아하고 신비로운 회색 털의 고양이",
-        "face_features": {"face_width": "narrow", "eye_shape": "narrow", "nose_size": "small", "mouth_width": "small", "face_length": "long"},
-        "personality": ["신비로움", "우아함", "조용함"],
-        "image": "/static/cats/russian_blue.png"
-    },
-    "샴": {
-        "name": "샴",
-        "description": "말이 많고 사교적인 동양계 고양이",
-        "face_features": {"face_width": "narrow", "eye_shape": "narrow", "nose_size": "small", "mouth_width": "small", "face_length": "long"},
-        "personality": ["수다스러움", "사교적", "활발함"],
-        "image": "/static/cats/siamese.png"
-    },
-    "브리티시 숏헤어": {
-        "name": "브리티시 숏헤어",
-        "description": "둥글고 통통한 얼굴의 영국 고양이",
-        "face_features": {"face_width": "wide", "eye_shape": "round", "nose_size": "medium", "mouth_width": "medium", "face_length": "short"},
-        "personality": ["차분함", "독립적", "온순함"],
-        "image": "/static/cats/british_shorthair.png"
-    },
-    "메인쿤": {
-        "name": "메인쿤",
-        "description": "대형 크기의 온순한 장모 고양이",
-        "face_features": {"face_width": "wide", "eye_shape": "oval", "nose_size": "medium", "mouth_width": "medium", "face_length": "medium"},
-        "personality": ["온순함", "친근함", "장난기"],
-        "image": "/static/cats/maine_coon.png"
-    },
-    "아비시니안": {
-        "name": "아비시니안",
-        "description": "활발하고 호기심 많은 단모 고양이",
-        "face_features": {"face_width": "medium", "eye_shape": "large", "nose_size": "small", "mouth_width": "small", "face_length": "medium"},
-        "personality": ["호기심", "활발함", "영리함"],
-        "image": "/static/cats/abyssinian.png"
-    },
-    "랙돌": {
-        "name": "랙돌",
-        "description": "온순하고 포근한 대형 장모 고양이",
-        "face_features": {"face_width": "wide", "eye_shape": "large", "nose_size": "medium", "mouth_width": "medium", "face_length": "medium"},
-        "personality": ["온순함", "포근함", "느긋함"],
-        "image": "/static/cats/ragdoll.png"
-    },
-    "스핑크스": {
-        "name": "스핑크스",
-        "description": "털이 없는 독특한 외모의 고양이",
-        "face_features": {"face_width": "medium", "eye_shape": "large", "nose_size": "large", "mouth_width": "wide", "face_length": "long"},
-        "personality": ["활발함", "사교적", "독특함"],
-        "image": "/static/cats/sphynx.png"
+inference_pool = InferencePool(
+    workers=settings.INFERENCE_WORKERS,
+    queue_size=settings.INFERENCE_QUEUE_SIZE,
+    timeout=settings.INFERENCE_TIMEOUT,
+    mode=settings.INFERENCE_MODE,
+    graph_options={
+        "refine_landmarks": settings.REFINE_LANDMARKS,
+        "detector": settings.FACE_PIPELINE == "detector",
+        "max_faces": settings.MAX_FACES
     }
-}
-
-FEATURE_SCORES = {
-    "face_width": {"very_wide": 5, "wide": 4, "medium": 3, "narrow": 2, "very_narrow": 1},
-    "eye_shape": {"large": 5, "round": 4, "oval": 3, "narrow": 2, "very_narrow": 1},
-    "nose_size": {"very_large": 5, "large": 4, "medium": 3, "small": 2, "very_small": 1},
-    "mouth_width": {"very_wide": 5, "wide": 4, "medium": 3, "small": 2, "very_small": 1},
-    "face_length": {"very_long": 5, "long": 4, "medium": 3, "short": 2, "very_short": 1}
-}
+)
 
-# =========================
-# MediaPipe 초기화
-# =========================
-mp_face_mesh = mp.solutions.face_mesh
-face_mesh = mp_face_mesh.FaceMesh(
-    static_image_mode=True,
-    max_num_faces=1,
-    refine_landmarks=True,
-    min_detection_confidence=0.5
+# 이미지 내용 해시 → 랜드마크 캐시 (얼굴 특징은 랜드마크로 다시 계산, 펫 타입별 매칭 결과는 저장하지 않음)
+result_cache = create_cache(
+    settings.CACHE_BACKEND,
+    max_entries=settings.CACHE_MAX_ENTRIES,
+    max_bytes=settings.CACHE_MAX_BYTES,
+    ttl=settings.CACHE_TTL,
+    path=settings.CACHE_PATH
 )
 
+metrics.Callback("pet_face_inference_queue_depth", "Inference jobs running or waiting", "gauge",
+                 lambda: inference_pool.pending)
+metrics.Callback("pet_face_cache_hits_total", "Landmark cache hits", "counter", lambda: result_cache.hits)
+metrics.Callback("pet_face_cache_misses_total", "Landmark cache misses", "counter", lambda: result_cache.misses)
+
 # =========================
 # 얼굴 분석 함수들
 # =========================
-def calculate_distance(point1, point2):
-    return math.sqrt((point1[0] - point2[0])**2 + (point1[1] - point2[1])**2)
+# "normalized": 눈 사이 거리로 크기 정규화 + 3D 머리 회전 보정 (촬영 거리/각도와 무관)
+NORMALIZE_MEASUREMENTS = settings.MEASUREMENT_MODE == "normalized"
 
-def analyze_face_features(landmarks):
-    points = [(lm.x, lm.y) for lm in landmarks]
-    features = {}
-    
+# 특징 단계 구간표 (Main과 FaceAnalyzer가 landmark_geometry를 통해 같이 사용)
+feature_thresholds.configure(settings.FEATURE_THRESHOLDS_PATH, settings.FEATURE_THRESHOLDS_RELOAD_SECONDS)
+
+DEFAULT_FEATURES = {"face_width": "medium", "eye_shape": "round", "nose_size": "medium", "mouth_width": "medium", "face_length": "medium"}
+
+def analyze_face_features(landmarks, aspect=1.0):
+    """랜드마크(MediaPipe 원본 또는 배열) → 얼굴 특징 (벡터 연산), aspect: 이미지 가로/세로 비율"""
     try:
-        # 얼굴 너비
-        left_cheek = points[234]
-        right_cheek = points[454] 
-        face_width = calculate_distance(left_cheek, right_cheek)
-        
-        if face_width > 0.25:
-            features["face_width"] = "very_wide"
-        elif face_width > 0.22:
-            features["face_width"] = "wide"
-        elif face_width > 0.19:
-            features["face_width"] = "medium"
-        elif face_width > 0.16:
-            features["face_width"] = "narrow"
-        else:
-            features["face_width"] = "very_narrow"
-            
-        # 눈 모양
-        left_eye_left = points[33]
-        left_eye_right = points[133]
-        left_eye_top = points[159]
-        left_eye_bottom = points[145]
-        
-        eye_width = calculate_distance(left_eye_left, left_eye_right)
-        eye_height = calculate_distance(left_eye_top, left_eye_bottom)
-        eye_area = eye_width * eye_height
-        ratio = eye_width / eye_height if eye_height > 0 else 3
-        
-        if eye_area > 0.003:
-            features["eye_shape"] = "large"
-        elif ratio > 3.5:
-            features["eye_shape"] = "narrow"
-        elif ratio < 2.5:
-            features["eye_shape"] = "round"
-        else:
-            features["eye_shape"] = "oval"
-            
-        # 코 크기
-        nose_left = points[220]
-        nose_right = points[440]
-        nose_top = points[6]
-        nose_bottom = points[2]
-        
-        nose_width = calculate_distance(nose_left, nose_right)
-        nose_height = calculate_distance(nose_top, nose_bottom)
-        nose_area = nose_width * nose_height
-        
-        if nose_area > 0.006:
-            features["nose_size"] = "very_large"
-        elif nose_area > 0.004:
-            features["nose_size"] = "large"
-        elif nose_area > 0.002:
-            features["nose_size"] = "medium"
-        elif nose_area > 0.001:
-            features["nose_size"] = "small"
-        else:
-            features["nose_size"] = "very_small"
-            
-        # 입 크기
-        mouth_left = points[61]
-        mouth_right = points[291]
-        mouth_width = calculate_distance(mouth_left, mouth_right)
-        
-        if mouth_width > 0.08:
-            features["mouth_width"] = "very_wide"
-        elif mouth_width > 0.065:
-            features["mouth_width"] = "wide"
-        elif mouth_width > 0.05:
-            features["mouth_width"] = "medium"
-        elif mouth_width > 0.035:
-            features["mouth_width"] = "small"
-        else:
-            features["mouth_width"] = "very_small"
-            
-        # 얼굴 길이
-        forehead = points[10]
-        chin = points[175]
-        face_length = calculate_distance(forehead, chin)
-        
-        if face_length > 0.35:
-            features["face_length"] = "very_long"
-        elif face_length > 0.3:
-            features["face_length"] = "long"
-        elif face_length > 0.25:
-            features["face_length"] = "medium"
-        elif face_length > 0.2:
-            features["face_length"] = "short"
-        else:
-            features["face_length"] = "very_short"
-            
+        return analyze_landmarks(landmarks_to_array(landmarks), NORMALIZE_MEASUREMENTS, aspect)
     except Exception as e:
-        print(f"Feature analysis error: {e}")
-        features = {"face_width": "medium", "eye_shape": "round", "nose_size": "medium", "mouth_width": "medium", "face_length": "medium"}
-    
-    return features
+        logger.warning(f"Feature analysis error: {e}")
+        return dict(DEFAULT_FEATURES)
 
-def calculate_similarity(human_features, pet_features):
-    weights = {"face_width": 0.25, "eye_shape": 0.25, "nose_size": 0.2, "mouth_width": 0.15, "face_length": 0.15}
-    total_score = 0
-    max_possible_score = 0
-    
-    for feature, weight in weights.items():
-        if feature in human_features and feature in pet_features:
-            human_score = FEATURE_SCORES.get(feature, {}).get(human_features[feature], 3)
-            pet_score = FEATURE_SCORES.get(feature, {}).get(pet_features[feature], 3)
-            diff = abs(human_score - pet_score)
-            similarity = max(0, 5 - diff)
-            total_score += similarity * weight
-            max_possible_score += 5 * weight
-    
-    return (total_score / max_possible_score) * 100 if max_possible_score > 0 else 0
+def analyze_face_vector(landmarks, aspect=1.0):
+    """랜드마크 → (얼굴 특징, 연속 특징 점수 벡터), 분석 실패 시 벡터는 None"""
+    try:
+        features, vectors = analyze_landmark_vectors(landmarks_to_array(landmarks)[None], NORMALIZE_MEASUREMENTS, aspect)
+        return features[0], vectors[0]
+    except Exception as e:
+        logger.warning(f"Feature analysis error: {e}")
+        return dict(DEFAULT_FEATURES), None
 
-def find_best_matches(human_features, pet_type="dog", top_n=3):
-    """펫 타입에 따라 다른 데이터베이스 사용"""
-    pet_database = DOG_BREEDS if pet_type == "dog" else CAT_BREEDS
-    matches = []
-    
-    for breed_name, breed_info in pet_database.items():
-        pet_features = breed_info["face_features"]
-        similarity = calculate_similarity(human_features, pet_features)
-        
-        matching_features = []
-        feature_names = {"face_width": "얼굴 너비", "eye_shape": "눈 모양", "nose_size": "코 크기", "mouth_width": "입 크기", "face_length": "얼굴 길이"}
-        for feature, human_value in human_features.items():
-            if feature in pet_features and human_value == pet_features[feature]:
-                matching_features.append(feature_names.get(feature, feature))
-        
-        matches.append({
-            "breed": breed_name,
-            "similarity": similarity,
-            "description": breed_info["description"],
-            "personality": breed_info["personality"],
-            "image": breed_info["image"],
-            "matching_features": matching_features
-        })
-    
-    matches.sort(key=lambda x: x["similarity"], reverse=True)
-    return matches[:top_n]
+def _run_face_mesh(rgb_image, max_num_faces):
+    """FaceMesh 실행 → 얼굴별 (L, 3) 랜드마크 배열 목록"""
+    with checkout_face_mesh(max_num_faces=max_num_faces) as face_mesh:
+        results = face_mesh.process(rgb_image)
+    return [landmarks_to_array(face.landmark) for face in results.multi_face_landmarks or []]
+
+def _detect_landmarks(contents, timer, max_num_faces=1):
+    """이미지 디코딩 + 얼굴 검출 → (이미지 가로/세로 비율, 얼굴별 (L, 3) 랜드마크 배열 목록)"""
+    import cv2
+
+    with timer.stage("decode"):
+        image = decode_image(contents, settings.MAX_IMAGE_SIDE)
+    if image is None:
+        raise ImageDecodeError()
+    aspect = image.shape[1] / image.shape[0]
+
+    with timer.stage("cvtColor"):
+        rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+    # 검출기 우선 모드는 1명 분석에만 사용 (근거리 검출기는 단체 사진의 작은 얼굴을 놓칠 수 있음)
+    if settings.FACE_PIPELINE == "detector" and max_num_faces == 1:
+        # 가벼운 검출기로 얼굴이 없는 이미지는 FaceMesh 전에 거절
+        with timer.stage("face_detection"):
+            with checkout_face_detector() as detector:
+                regions = detect_regions(rgb_image, detector)
+        if not regions:
+            raise FaceNotFoundError()
+        # 가장 확실한 얼굴 영역만 잘라서 랜드마크 계산 후 원본 좌표로 변환
+        with timer.stage("face_mesh"):
+            crop, region = crop_region(rgb_image, regions[0][1])
+            faces = _run_face_mesh(crop, 1)
+        if faces:
+            return aspect, [remap_landmarks(faces[0], region, rgb_image.shape)]
+
+    # 여러 얼굴 모드이거나 잘라낸 영역에서 랜드마크를 못 찾으면 전체 프레임 사용
+    with timer.stage("face_mesh"):
+        faces = _run_face_mesh(rgb_image, max_num_faces)
+    if not faces:
+        raise FaceNotFoundError()
+    return aspect, faces
+
+def detect_face_features(contents):
+    """이미지 디코딩 + 얼굴 검출 + 특징 분석 (워커에서 실행)
+
+    → (랜드마크 배열, 이미지 가로/세로 비율, 특징, 연속 특징 벡터, 단계별 시간)
+    """
+    timer = StageTimer()
+    aspect, faces = _detect_landmarks(contents, timer)
+    with timer.stage("features"):
+        landmarks = faces[0]
+        human_features, feature_vector = analyze_face_vector(landmarks, aspect)
+    return landmarks, aspect, human_features, feature_vector, timer.timings
+
+def detect_faces(contents, max_num_faces):
+    """한 번의 FaceMesh 실행으로 여러 얼굴 검출 (워커에서 실행) → ((N, L, 3) 랜드마크, 가로/세로 비율, 단계별 시간)"""
+    timer = StageTimer()
+    aspect, faces = _detect_landmarks(contents, timer, max_num_faces)
+    return np.stack(faces), aspect, timer.timings
+
+def match_faces(faces, pet_type="dog", top_n=3):
+    """[(특징, 연속 특징 벡터)] → 얼굴별 매칭 결과 (MATCH_MODE에 따라 버킷 점수 또는 연속 벡터로 계산)"""
+    matrix = BREED_MATRICES[pet_type]
+    features_list = [features for features, _ in faces]
+    if settings.MATCH_MODE == "continuous" and all(vector is not None for _, vector in faces):
+        vectors = np.array([vector for _, vector in faces], dtype=np.float64).reshape(-1, len(VECTOR_FEATURES))
+        return matrix.find_best_matches_vectors(features_list, vectors, top_n=top_n)
+    return matrix.find_best_matches_batch(features_list, top_n=top_n)
+
+def find_best_matches(human_features, pet_type="dog", top_n=3, feature_vector=None):
+    """펫 타입에 따라 다른 품종 행렬 사용 (벡터 연산으로 유사도 계산)"""
+    return match_faces([(human_features, feature_vector)], pet_type=pet_type, top_n=top_n)[0]
 
 def get_face_analysis(features, pet_type="dog"):
     width = features.get("face_width", "medium")
@@ -362,12 +296,23 @@ def get_face_analysis(features, pet_type="dog"):
         "recommendations": recommendations
     }
 
+# 특징 조합(5단계 × 5개)별 매칭/분석 결과 표 (펫 타입별 3125칸, ANSWER_TABLE=0이면 사용 안 함)
+ANSWER_TABLES = {
+    pet_type: AnswerTable(pet_type, BREED_MATRICES[pet_type], get_face_analysis)
+    for pet_type in BREED_MATRICES
+} if settings.ANSWER_TABLE else {}
+
+def answer_lookup(human_features, pet_type, feature_vector=None):
+    """표로 답할 수 있으면 (결과 dict, 응답 JSON 조각), 아니면 None (연속 매칭 모드는 표를 쓰지 않음)"""
+    if not ANSWER_TABLES or (settings.MATCH_MODE == "continuous" and feature_vector is not None):
+        return None
+    with metrics.STAGE_SECONDS.time("answer_lookup"):
+        return ANSWER_TABLES[pet_type].lookup(human_features)
+
 # =========================
 # 웹페이지 (JavaScript 수정)
 # =========================
-@app.get("/", response_class=HTMLResponse)
-def home():
-    return """
+HOME_PAGE_HTML = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -432,6 +377,8 @@ def home():
             }
             .upload-btn:hover { transform: translateY(-2px); }
             .preview-image { max-width: 200px; max-height: 200px; border-radius: 10px; margin: 20px 0; }
+            .camera-section { text-align: center; margin-top: 20px; }
+            .camera-section video { display: block; margin: 20px auto 0; transform: scaleX(-1); }
             .loading { display: none; text-align: center; padding: 20px; }
             .spinner {
                 border: 4px solid #f3f3f3; border-top: 4px solid #667eea; border-radius: 50%;
@@ -449,6 +396,7 @@ def home():
                 background: #f8f9fa; display: flex; align-items: center; justify-content: center;
                 box-shadow: 0 4px 12px rgba(0,0,0,0.1);
             }
+            .pet-image-container picture { display: block; width: 100%; height: 100%; }
             .pet-image { width: 100%; height: 100%; object-fit: cover; transition: transform 0.3s ease; }
             .pet-image:hover { transform: scale(1.1); }
             .fallback-placeholder {
@@ -528,6 +476,12 @@ def home():
                         <input type="file" id="file-input" accept="image/jpeg,image/jpg,image/png,image/webp">
                         <img id="preview" class="preview-image" style="display: none;">
                     </div>
+
+                    <div class="camera-section" id="camera-section" style="display: none;">
+                        <button class="upload-btn" type="button" id="camera-btn" onclick="toggleCamera()">📷 실시간 카메라로 찾기</button>
+                        <video id="camera-video" class="preview-image" autoplay playsinline muted style="display: none;"></video>
+                        <p id="camera-status"></p>
+                    </div>
                     
                     <div class="loading" id="loading">
                         <div class="spinner"></div>
@@ -561,6 +515,10 @@ def home():
             const errorContainer = document.getElementById('error-container');
             const petSelection = document.getElementById('pet-selection');
             const resetBtn = document.getElementById('reset-btn');
+            const cameraSection = document.getElementById('camera-section');
+            const cameraBtn = document.getElementById('camera-btn');
+            const cameraVideo = document.getElementById('camera-video');
+            const cameraStatus = document.getElementById('camera-status');
 
             // 펫 선택 이벤트
             document.querySelectorAll('.pet-option').forEach(option => {
@@ -576,6 +534,9 @@ def home():
                         petSelection.style.display = 'none';
                         uploadSection.style.display = 'block';
                         resetBtn.style.display = 'inline-block';
+                        if (navigator.mediaDevices && window.WebSocket) {
+                            cameraSection.style.display = 'block';
+                        }
                         
                         // 업로드 섹션 텍스트 업데이트
                         const petEmoji = selectedPetType === 'dog' ? '🐶' : '🐱';
@@ -588,7 +549,9 @@ def home():
             });
 
             function resetSelection() {
+                stopCamera();
                 selectedPetType = null;
+                cameraSection.style.display = 'none';
                 petSelection.style.display = 'block';
                 uploadSection.style.display = 'none';
                 resetBtn.style.display = 'none';
@@ -705,7 +668,7 @@ def home():
                 }
             }
 
-            function displayResults(data) {
+            function displayResults(data, scroll = true) {
                 const petName = selectedPetType === 'dog' ? '강아지' : '고양이';
                 const petEmoji = selectedPetType === 'dog' ? '🐶' : '🐱';
                 
@@ -743,8 +706,16 @@ def home():
                     card.innerHTML = `
                         <div class="pet-info">
                             <div class="pet-image-container">
-                                <img src="${match.image}" alt="${match.breed}" class="pet-image" 
-                                     onerror="handleImageError(this, '${match.breed}', '${petEmoji}')">
+                                ${match.thumbnail ? `
+                                <picture>
+                                    <source type="image/webp" srcset="${match.thumbnail.webp}">
+                                    <img src="${match.thumbnail.src}" srcset="${match.thumbnail.jpeg}" width="120" height="120"
+                                         alt="${match.breed}" class="pet-image" loading="lazy" decoding="async"
+                                         onerror="handleImageError(this, '${match.breed}', '${petEmoji}')">
+                                </picture>` : `
+                                <img src="${match.image_url}" alt="${match.breed}" class="pet-image" width="120" height="120"
+                                     loading="lazy" decoding="async"
+                                     onerror="handleImageError(this, '${match.breed}', '${petEmoji}')">`}
                             </div>
                             <div class="pet-details">
                                 <div class="breed-name">${rank} ${match.breed}</div>
@@ -769,7 +740,96 @@ def home():
                 });
 
                 results.style.display = 'block';
-                results.scrollIntoView({ behavior: 'smooth' });
+                if (scroll) {
+                    results.scrollIntoView({ behavior: 'smooth' });
+                }
+            }
+
+            // 실시간 카메라: 약 15fps로 JPEG 프레임을 보내고, 매칭 결과가 바뀔 때마다 받아서 표시
+            let cameraStream = null;
+            let cameraSocket = null;
+            let cameraTimer = null;
+            const frameCanvas = document.createElement('canvas');
+
+            async function toggleCamera() {
+                if (cameraStream) {
+                    stopCamera();
+                } else {
+                    await startCamera();
+                }
+            }
+
+            async function startCamera() {
+                clearError();
+                try {
+                    cameraStream = await navigator.mediaDevices.getUserMedia({ video: { width: 640, height: 480 }, audio: false });
+                } catch (error) {
+                    console.error("카메라 오류:", error);
+                    showError('카메라를 사용할 수 없습니다. 브라우저 권한을 확인해주세요.');
+                    return;
+                }
+                cameraVideo.srcObject = cameraStream;
+                cameraVideo.style.display = 'block';
+                cameraBtn.textContent = '⏹ 카메라 끄기';
+                cameraStatus.textContent = '연결 중...';
+
+                const protocol = location.protocol === 'https:' ? 'wss' : 'ws';
+                const socket = new WebSocket(`${protocol}://${location.host}/ws/video?pet_type=${selectedPetType}`);
+                cameraSocket = socket;
+                socket.onopen = () => {
+                    cameraStatus.textContent = '얼굴을 찾는 중...';
+                    cameraTimer = setInterval(sendFrame, 66);
+                };
+                socket.onmessage = (event) => {
+                    const data = JSON.parse(event.data);
+                    if (data.type === 'result') {
+                        cameraStatus.textContent = `분석 중 (${data.stats.fps} fps)`;
+                        displayResults(data, false);
+                    } else if (data.type === 'no_face') {
+                        cameraStatus.textContent = '얼굴을 찾는 중...';
+                    }
+                };
+                socket.onclose = (event) => {
+                    if (cameraSocket !== socket) {
+                        return;
+                    }
+                    stopCamera();
+                    if (event.code === 1013) {
+                        showError('카메라 연결이 많아 잠시 후 다시 시도해주세요.');
+                    }
+                };
+            }
+
+            function sendFrame() {
+                // 이전 프레임이 아직 전송 중이면 건너뜀 (서버도 밀린 프레임은 최신 것만 남기고 버림)
+                if (!cameraSocket || cameraSocket.readyState !== WebSocket.OPEN || cameraSocket.bufferedAmount > 0 || !cameraVideo.videoWidth) {
+                    return;
+                }
+                frameCanvas.width = cameraVideo.videoWidth;
+                frameCanvas.height = cameraVideo.videoHeight;
+                frameCanvas.getContext('2d').drawImage(cameraVideo, 0, 0);
+                frameCanvas.toBlob(blob => {
+                    if (blob && cameraSocket && cameraSocket.readyState === WebSocket.OPEN) {
+                        cameraSocket.send(blob);
+                    }
+                }, 'image/jpeg', 0.8);
+            }
+
+            function stopCamera() {
+                clearInterval(cameraTimer);
+                cameraTimer = null;
+                if (cameraSocket) {
+                    const socket = cameraSocket;
+                    cameraSocket = null;
+                    socket.close();
+                }
+                if (cameraStream) {
+                    cameraStream.getTracks().forEach(track => track.stop());
+                    cameraStream = null;
+                }
+                cameraVideo.style.display = 'none';
+                cameraBtn.textContent = '📷 실시간 카메라로 찾기';
+                cameraStatus.textContent = '';
             }
 
             // 이미지 로드 실패시 처리 함수 (개선됨)
@@ -790,19 +850,170 @@ def home():
                 `;
                 
                 // 이미지 요소를 대체 요소로 교체
-                img.parentElement.appendChild(placeholder);
+                (img.closest('.pet-image-container') || img.parentElement).appendChild(placeholder);
             }
         </script>
     </body>
     </html>
     """
 
+# 시작 시 한 번만 렌더링 + 압축 (요청마다 문자열 생성/압축하지 않음)
+home_page = PrecompressedAsset(HOME_PAGE_HTML.encode("utf-8"), "text/html; charset=utf-8")
+
+@app.get("/", response_class=HTMLResponse)
+def home(request: Request):
+    return home_page.response(request.headers)
+
 # =========================
 # API 엔드포인트들
 # =========================
+ZIP_CONTENT_TYPES = ("application/zip", "application/x-zip-compressed")
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".bmp")
+
+
+class AnalysisError(Exception):
+    """사용자에게 돌려줄 분석 실패 (HTTP 상태 코드와 메시지 포함)"""
+
+    def __init__(self, status_code, message, headers=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+        self.headers = headers
+
+
+async def run_detection(fn, *args):
+    """워커 풀에서 얼굴 검출 실행, 실패는 AnalysisError로 변환"""
+    # 디코딩과 얼굴 분석은 워커 풀에서 실행 (이벤트 루프 블로킹 방지)
+    try:
+        return await inference_pool.run(fn, *args)
+    except PoolFullError as e:
+        metrics.FAILURES.inc("queue_full")
+        raise AnalysisError(429, "요청이 많아 잠시 후 다시 시도해주세요.", {"Retry-After": str(e.retry_after)})
+    except asyncio.TimeoutError:
+        metrics.FAILURES.inc("timeout")
+        raise AnalysisError(504, "분석 시간이 초과되었습니다. 다시 시도해주세요.")
+    except ImageDecodeError:
+        metrics.FAILURES.inc("decode_error")
+        raise AnalysisError(400, "이미지를 읽을 수 없습니다. 다른 이미지를 시도해보세요.")
+    except FaceNotFoundError:
+        metrics.FAILURES.inc("no_face")
+        raise AnalysisError(400, "얼굴을 찾을 수 없습니다. 얼굴이 잘 보이는 사진을 사용해주세요.")
+
+
+async def _cache_lookup(contents, suffix=b""):
+    """캐시 키와 캐시된 (랜드마크, 가로/세로 비율) 반환 (캐시를 쓰지 않으면 (None, None))"""
+    if not result_cache.enabled:
+        return None, None
+    with metrics.STAGE_SECONDS.time("cache_lookup"):
+        key = content_key(contents) + suffix
+        if result_cache.blocking:
+            # SQLite는 다른 워커와 잠금 경쟁 시 오래 기다릴 수 있으므로 이벤트 루프 밖에서 조회
+            return key, await asyncio.to_thread(result_cache.get, key)
+        return key, result_cache.get(key)
+
+
+async def _cache_put(key, landmarks, aspect):
+    if result_cache.blocking:
+        await asyncio.to_thread(result_cache.put, key, landmarks, aspect)
+    else:
+        result_cache.put(key, landmarks, aspect)
+
+
+async def extract_features(contents):
+    """업로드 바이트 → (얼굴 특징, 연속 특징 벡터), 실패 시 AnalysisError"""
+    # 같은 이미지를 다시 올린 경우 (재시도, 펫 타입 변경) 캐시된 결과 사용
+    key, cached = await _cache_lookup(contents)
+    if cached is not None:
+        landmarks, aspect = cached
+        return analyze_face_vector(landmarks, aspect)
+
+    landmarks, aspect, human_features, feature_vector, timings = await run_detection(detect_face_features, contents)
+    metrics.observe_stages(timings)
+
+    if key is not None:
+        await _cache_put(key, landmarks, aspect)
+    return human_features, feature_vector
+
+
+async def extract_faces(contents):
+    """업로드 바이트 → 최대 MAX_FACES명의 ((N, L, 3) 랜드마크, 가로/세로 비율), 실패 시 AnalysisError"""
+    # 여러 얼굴 결과는 1명 결과와 다른 키로 캐시
+    key, cached = await _cache_lookup(contents, b":faces")
+    if cached is not None:
+        return cached
+
+    landmarks, aspect, timings = await run_detection(detect_faces, contents, settings.MAX_FACES)
+    metrics.observe_stages(timings)
+
+    if key is not None:
+        await _cache_put(key, landmarks, aspect)
+    return landmarks, aspect
+
+
+def build_analysis(human_features, pet_type, matches=None, feature_vector=None):
+    """얼굴 특징 → 특징/분석/매칭 결과"""
+    if matches is None:
+        answer = answer_lookup(human_features, pet_type, feature_vector)
+        if answer is not None:
+            return dict(answer[0])
+        with metrics.STAGE_SECONDS.time("matching"):
+            matches = find_best_matches(human_features, pet_type=pet_type, top_n=3, feature_vector=feature_vector)
+    with metrics.STAGE_SECONDS.time("analysis"):
+        face_analysis = get_face_analysis(human_features, pet_type=pet_type)
+    result = {
+        "human_features": human_features,
+        "face_analysis": face_analysis,
+        "matches": matches
+    }
+    if settings.MATCH_MODE == "continuous" and feature_vector is not None:
+        # 1~5 연속 점수 (FEATURE_SCORES와 같은 척도)
+        result["feature_vector"] = {
+            feature: round(float(value), 3) for feature, value in zip(VECTOR_FEATURES, feature_vector)
+        }
+    return result
+
+
+def answer_response(head, answer):
+    """head 필드 뒤에 미리 직렬화한 결과 조각을 그대로 붙인 JSON 응답 (결과 JSON 인코딩 생략)"""
+    head = json.dumps(head, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return Response(content=head[:-1] + b"," + answer[1] + b"}", media_type="application/json")
+
+
+async def analyze_group_bytes(contents, pet_type, max_faces):
+    """여러 얼굴 분석 → 얼굴별 영역/특징/분석/매칭 결과 (왼쪽부터), 실패 시 AnalysisError"""
+    landmarks, aspect = await extract_faces(contents)
+
+    # 큰 얼굴부터 max_faces명을 고른 뒤 왼쪽 → 오른쪽 순서로 정렬
+    boxes = bounding_boxes(landmarks)
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    selected = np.argsort(-areas, kind="stable")[:max_faces]
+    selected = selected[np.argsort(boxes[selected, 0], kind="stable")]
+
+    with metrics.STAGE_SECONDS.time("features"):
+        features_list, vectors = analyze_landmark_vectors(landmarks[selected], NORMALIZE_MEASUREMENTS, aspect)
+    faces = list(zip(features_list, vectors))
+    with metrics.STAGE_SECONDS.time("matching"):
+        matches_list = match_faces(faces, pet_type=pet_type, top_n=3)
+
+    results = []
+    for index, (box, (human_features, feature_vector), matches) in enumerate(zip(boxes[selected], faces, matches_list)):
+        x_min, y_min, x_max, y_max = (round(float(value), 4) for value in box)
+        results.append({
+            "face_index": index,
+            # 정규화 좌표 (0~1, 이미지 왼쪽 위 기준)
+            "bounding_box": {"x": x_min, "y": y_min, "width": round(x_max - x_min, 4), "height": round(y_max - y_min, 4)},
+            **build_analysis(human_features, pet_type, matches, feature_vector=feature_vector)
+        })
+    return {"face_count": len(results), "faces": results}
+
+
 @app.post("/analyze-face")
-async def analyze_face(file: UploadFile = File(...), pet_type: str = Query("dog", regex="^(dog|cat)$")):
-    """얼굴 분석 및 펫 매칭 API"""
+async def analyze_face(
+    file: UploadFile = File(...),
+    pet_type: str = Query("dog", regex="^(dog|cat)$"),
+    max_faces: int = Query(1, ge=1, le=settings.MAX_FACES)
+):
+    """얼굴 분석 및 펫 매칭 API (max_faces > 1이면 단체 사진의 얼굴별 결과)"""
     try:
         # 파일 유효성 검사
         if not file.content_type or not file.content_type.startswith('image/'):
@@ -811,78 +1022,331 @@ async def analyze_face(file: UploadFile = File(...), pet_type: str = Query("dog"
                 status_code=400
             )
         
-        # 파일 크기 제한 (10MB)
-        contents = await file.read()
-        if len(contents) > 10 * 1024 * 1024:
+        # 파일 크기 제한 (10MB), 청크 단위로 읽다가 초과하면 즉시 중단
+        contents = await read_upload(file, MAX_UPLOAD_BYTES)
+        if contents is None:
             return JSONResponse(
                 content={"success": False, "error": "파일 크기는 10MB 이하여야 합니다."}, 
-                status_code=400
-            )
-        
-        # 이미지 디코딩
-        np_arr = np.frombuffer(contents, np.uint8)
-        image = cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
-        
-        if image is None:
-            return JSONResponse(
-                content={"success": False, "error": "이미지를 읽을 수 없습니다. 다른 이미지를 시도해보세요."}, 
-                status_code=400
+                status_code=413
             )
 
-        # RGB 변환 및 얼굴 검출
-        rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        results = face_mesh.process(rgb_image)
-
-        if not results.multi_face_landmarks:
+        try:
+            if max_faces > 1:
+                result = await analyze_group_bytes(contents, pet_type, max_faces)
+            else:
+                human_features, feature_vector = await extract_features(contents)
+                answer = answer_lookup(human_features, pet_type, feature_vector)
+                if answer is not None:
+                    return answer_response({"success": True, "filename": file.filename, "pet_type": pet_type}, answer)
+                result = build_analysis(human_features, pet_type, feature_vector=feature_vector)
+        except AnalysisError as e:
             return JSONResponse(
-                content={"success": False, "error": "얼굴을 찾을 수 없습니다. 얼굴이 잘 보이는 사진을 사용해주세요."}, 
-                status_code=400
+                content={"success": False, "error": e.message},
+                status_code=e.status_code,
+                headers=e.headers
             )
-
-        # 얼굴 특징 분석
-        landmarks = results.multi_face_landmarks[0].landmark
-        human_features = analyze_face_features(landmarks)
-        matches = find_best_matches(human_features, pet_type=pet_type, top_n=3)
-        face_analysis = get_face_analysis(human_features, pet_type=pet_type)
         
         return {
             "success": True,
             "filename": file.filename,
             "pet_type": pet_type,
-            "human_features": human_features,
-            "face_analysis": face_analysis,
-            "matches": matches
+            **result
         }
         
     except Exception as e:
-        print(f"Error in analyze_face: {str(e)}")
+        logger.exception("Error in analyze_face")
+        metrics.FAILURES.inc("internal")
         return JSONResponse(
             content={"success": False, "error": f"분석 중 오류가 발생했습니다: {str(e)}"}, 
             status_code=500
         )
 
+
+def _is_zip_upload(file):
+    return file.content_type in ZIP_CONTENT_TYPES or (file.filename or "").lower().endswith(".zip")
+
+
+def _batch_limit_error():
+    return AnalysisError(400, f"한 번에 최대 {settings.BATCH_MAX_IMAGES}장까지 분석할 수 있습니다.")
+
+
+def _read_zip_images(file, max_images, max_bytes):
+    """zip 파일 안의 이미지들을 (파일명, 바이트 또는 AnalysisError) 목록과 압축 해제한 바이트 수로 반환 (워커 스레드에서 실행)
+
+    압축을 풀기 전에 목록만으로 이미지 수를 확인해 max_images를 넘으면 AnalysisError,
+    압축 해제 크기 합계가 max_bytes를 넘는 순간부터는 나머지 이미지를 읽지 않음
+    """
+    items = []
+    used = 0
+    with zipfile.ZipFile(file.file) as archive:
+        entries = [
+            info for info in archive.infolist()
+            if not info.is_dir() and info.filename.lower().endswith(IMAGE_EXTENSIONS)
+        ]
+        if len(entries) > max_images:
+            raise _batch_limit_error()
+        for info in entries:
+            # 압축 해제 전에 원본 크기를 확인 (zip bomb 방지, 실제 해제량도 file_size를 넘지 않음)
+            if info.file_size > MAX_UPLOAD_BYTES:
+                items.append((info.filename, AnalysisError(413, "파일 크기는 10MB 이하여야 합니다.")))
+            elif used + info.file_size > max_bytes:
+                used = max_bytes
+                items.append((info.filename, AnalysisError(413, "압축을 푼 전체 크기가 너무 커서 분석하지 않았습니다.")))
+            else:
+                used += info.file_size
+                items.append((info.filename, _read_zip_entry(archive, info)))
+    return items, used
+
+
+def _read_zip_entry(archive, info):
+    """zip 항목 1개의 바이트 (암호화/지원하지 않는 압축 방식/손상된 항목은 AnalysisError, 나머지 항목은 계속 분석)"""
+    try:
+        return archive.read(info)
+    except RuntimeError:
+        # 암호가 걸린 항목
+        return AnalysisError(400, "암호가 걸린 파일은 분석할 수 없습니다.")
+    except NotImplementedError:
+        return AnalysisError(400, "지원하지 않는 압축 방식입니다.")
+    except (zipfile.BadZipFile, zlib.error):
+        return AnalysisError(400, "zip 파일 안의 이미지가 손상되었습니다.")
+
+
+@app.post("/analyze-faces/batch")
+async def analyze_faces_batch(files: List[UploadFile] = File(...), pet_type: str = Query("dog", regex="^(dog|cat)$")):
+    """여러 장의 사진(또는 zip)을 한 번에 분석하는 API, 이미지별 성공/실패를 따로 보고"""
+    try:
+        return await _analyze_batch(files, pet_type)
+    except Exception as e:
+        logger.exception("Error in analyze_faces_batch")
+        metrics.FAILURES.inc("internal")
+        return JSONResponse(
+            content={"success": False, "error": f"분석 중 오류가 발생했습니다: {str(e)}"},
+            status_code=500
+        )
+
+
+async def _analyze_batch(files, pet_type):
+    items = []
+    uncompressed_budget = settings.BATCH_MAX_UNCOMPRESSED_BYTES
+    for file in files:
+        if _is_zip_upload(file):
+            try:
+                # 압축 해제는 CPU/메모리를 쓰므로 이벤트 루프 밖에서 실행
+                zip_items, used = await asyncio.to_thread(
+                    _read_zip_images, file, settings.BATCH_MAX_IMAGES - len(items), uncompressed_budget
+                )
+            except zipfile.BadZipFile:
+                items.append((file.filename, AnalysisError(400, "zip 파일을 읽을 수 없습니다.")))
+                continue
+            except AnalysisError as e:
+                return JSONResponse(content={"success": False, "error": e.message}, status_code=e.status_code)
+            items.extend(zip_items)
+            uncompressed_budget -= used
+        elif not file.content_type or not file.content_type.startswith('image/'):
+            items.append((file.filename, AnalysisError(400, "이미지 파일만 업로드 가능합니다.")))
+        else:
+            contents = await read_upload(file, MAX_UPLOAD_BYTES)
+            if contents is None:
+                items.append((file.filename, AnalysisError(413, "파일 크기는 10MB 이하여야 합니다.")))
+            else:
+                items.append((file.filename, contents))
+
+    if len(items) > settings.BATCH_MAX_IMAGES:
+        return JSONResponse(content={"success": False, "error": _batch_limit_error().message}, status_code=400)
+
+    # 배치 하나가 대기열 전체를 차지하지 않도록 동시에 워커 수만큼만 제출
+    semaphore = asyncio.Semaphore(inference_pool.workers)
+
+    async def extract_item(contents):
+        if isinstance(contents, AnalysisError):
+            return contents
+        try:
+            async with semaphore:
+                return await extract_features(contents)
+        except AnalysisError as e:
+            return e
+        except Exception as e:
+            logger.exception("Error in analyze_faces_batch")
+            metrics.FAILURES.inc("internal")
+            return AnalysisError(500, f"분석 중 오류가 발생했습니다: {str(e)}")
+
+    extracted = await asyncio.gather(*(extract_item(contents) for _, contents in items))
+
+    # 얼굴을 찾은 이미지들은 한 번의 행렬 연산으로 매칭
+    found = [face for face in extracted if not isinstance(face, AnalysisError)]
+    with metrics.STAGE_SECONDS.time("matching"):
+        batch_matches = iter(match_faces(found, pet_type=pet_type, top_n=3))
+
+    results = []
+    for (filename, _), face in zip(items, extracted):
+        if isinstance(face, AnalysisError):
+            results.append({"filename": filename, "success": False, "status": face.status_code, "error": face.message})
+        else:
+            features, feature_vector = face
+            results.append({
+                "filename": filename,
+                "success": True,
+                **build_analysis(features, pet_type, next(batch_matches), feature_vector=feature_vector)
+            })
+
+    succeeded = len(found)
+    return {
+        "success": True,
+        "pet_type": pet_type,
+        "total": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "results": results
+    }
+
+@app.post("/analyze-landmarks")
+async def analyze_landmarks_endpoint(
+    request: Request,
+    pet_type: str = Query("dog", regex="^(dog|cat)$"),
+    aspect: float = Query(None, gt=0)
+):
+    """클라이언트(브라우저/모바일 MediaPipe)가 계산한 랜드마크로 매칭 (이미지 디코딩/FaceMesh 생략)
+
+    본문 (Content-Type으로 구분):
+      application/octet-stream: little-endian float32 x, y, z × 468 또는 478점 (478점 = 5736바이트)
+      application/json: {"landmarks": [{"x", "y", "z"}, ...] 또는 [[x, y, z], ...], "aspect": 가로/세로}
+    aspect(이미지 가로/세로 비율)는 정규화 측정 모드에서만 사용, 쿼리 값이 본문 값보다 우선
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type not in ("application/octet-stream", "application/json"):
+        return JSONResponse(
+            content={"success": False, "error": "application/octet-stream 또는 application/json 본문만 지원합니다."},
+            status_code=415
+        )
+    body = await request.body()
+    try:
+        if content_type == "application/json":
+            points, body_aspect = decode_json(body)
+        else:
+            points, body_aspect = decode_packed(body), None
+    except LandmarkPayloadError as e:
+        metrics.FAILURES.inc("invalid_landmarks")
+        return JSONResponse(content={"success": False, "error": str(e)}, status_code=400)
+
+    aspect = aspect or body_aspect or 1.0
+    with metrics.STAGE_SECONDS.time("features"):
+        if settings.MATCH_MODE == "continuous":
+            human_features, feature_vector = analyze_face_vector(points, aspect)
+        else:
+            # 기본(단계) 매칭에서는 연속 특징 벡터가 필요 없음
+            human_features, feature_vector = analyze_face_features(points, aspect), None
+    answer = answer_lookup(human_features, pet_type, feature_vector)
+    if answer is not None:
+        return answer_response({"success": True, "pet_type": pet_type}, answer)
+    return {
+        "success": True,
+        "pet_type": pet_type,
+        **build_analysis(human_features, pet_type, feature_vector=feature_vector)
+    }
+
+
 @app.post("/find_similar_dog")
 async def find_similar_dog(file: UploadFile = File(...)):
     """기존 API 호환성을 위한 엔드포인트 (강아지만)"""
-    return await analyze_face(file, pet_type="dog")
+    return await analyze_face(file, pet_type="dog", max_faces=1)
+
+# =========================
+# 실시간 카메라 (WebSocket)
+# =========================
+video_connections = {"active": 0}
+metrics.Callback("pet_face_video_connections", "Open /ws/video connections", "gauge",
+                 lambda: video_connections["active"])
+
+
+@app.websocket("/ws/video")
+async def video_stream(websocket: WebSocket, pet_type: str = Query("dog", regex="^(dog|cat)$")):
+    """웹캠 JPEG 프레임(바이너리 메시지)을 받아 매칭 결과가 바뀔 때만 전송
+
+    보내는 메시지: {"type": "result", 특징/분석/매칭, "stats"}, {"type": "no_face", "stats"}, {"type": "error", "error"}
+    분석보다 빨리 들어온 프레임은 가장 최근 것만 남기고 버림
+    """
+    if video_connections["active"] >= settings.VIDEO_MAX_CONNECTIONS:
+        # 1013: 서버 과부하, 잠시 후 다시 시도 (accept 전에 닫으면 HTTP 403 거절이 되어 클라이언트가 코드를 받지 못함)
+        await websocket.accept()
+        await websocket.close(code=1013)
+        return
+    video_connections["active"] += 1
+    session = None
+    receiver = None
+    try:
+        await websocket.accept()
+        # 그래프 생성은 수십 ms가 걸리므로 이벤트 루프 밖에서 실행
+        session = await asyncio.to_thread(
+            VideoSession, settings.VIDEO_SMOOTHING_WINDOW, settings.VIDEO_MAX_SIDE,
+            NORMALIZE_MEASUREMENTS, settings.REFINE_LANDMARKS
+        )
+        slot = FrameSlot()
+        receiver = asyncio.create_task(receive_frames(websocket, slot, settings.VIDEO_MAX_FRAME_BYTES))
+        started = time.perf_counter()
+        processed = 0
+        last_signature = None
+
+        while True:
+            frame = await slot.get()
+            if frame is None:
+                break
+            try:
+                result = await session.analyze(frame)
+            except ImageDecodeError:
+                if not slot.closed:
+                    await websocket.send_json({"type": "error", "error": "프레임을 읽을 수 없습니다."})
+                continue
+            if slot.closed:
+                # 분석하는 동안 연결이 끊김
+                break
+            processed += 1
+
+            if result is None:
+                signature = None
+                message = {"type": "no_face"}
+            else:
+                human_features, feature_vector = result
+                message = {"type": "result", **build_analysis(human_features, pet_type, feature_vector=feature_vector)}
+                # 특징이나 품종 순위가 바뀔 때만 전송 (연속 모드의 유사도 소수점 변화는 무시)
+                signature = (tuple(human_features.values()), tuple(match["breed"] for match in message["matches"]))
+            if signature == last_signature and processed > 1:
+                continue
+            last_signature = signature
+            elapsed = time.perf_counter() - started
+            message["stats"] = {
+                "received": slot.received,
+                "processed": processed,
+                "dropped": slot.dropped,
+                "fps": round(processed / elapsed, 1) if elapsed > 0 else 0.0
+            }
+            await websocket.send_json(message)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        video_connections["active"] -= 1
+        if receiver is not None:
+            receiver.cancel()
+        if session is not None:
+            # 워커 스레드에서 분석 중인 프레임이 있으면 그 분석이 끝난 뒤에 그래프를 닫음
+            session.close()
+
 
 @app.get("/breeds")
-def get_breeds(type: str = Query("dog", regex="^(dog|cat)$")):
-    """펫 품종 목록 조회"""
-    if type == "dog":
-        return {
-            "type": "dog",
-            "breeds": list(DOG_BREEDS.keys()),
-            "total_breeds": len(DOG_BREEDS),
-            "breed_details": DOG_BREEDS
-        }
-    else:  # cat
+def get_breeds(
+    request: Request,
+    type: str = Query("dog", regex="^(dog|cat)$"),
+    feature: str = Query(None),
+    value: str = Query(None)
+):
+    """펫 품종 목록 조회 (feature/value를 주면 해당 특징값을 가진 품종만)"""
+    if feature is not None or value is not None:
         return {
-            "type": "cat",
-            "breeds": list(CAT_BREEDS.keys()),
-            "total_breeds": len(CAT_BREEDS),
-            "breed_details": CAT_BREEDS
+            "type": type,
+            "feature": feature,
+            "value": value,
+            "breeds": list(breed_catalog.find(type, feature, value))
         }
+    return breed_catalog.breeds_response(type, request.headers)
 
 @app.get("/health")
 def health_check():
@@ -890,13 +1354,42 @@ def health_check():
     return {
         "status": "healthy", 
         "message": "펫 닮은꼴 찾기 API가 정상 작동 중입니다",
+        "ready": warm_up_state["ready"],
         "supported_pets": ["dog", "cat"],
         "total_breeds": {
             "dogs": len(DOG_BREEDS),
             "cats": len(CAT_BREEDS)
-        }
+        },
+        "inference": inference_pool.stats(),
+        "cache": result_cache.stats()
     }
 
+@app.get("/health/live")
+def liveness_check():
+    """프로세스가 요청에 응답하는지 확인 (워밍업과 무관)"""
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+def readiness_check():
+    """워밍업(그래프 생성 + 더미 추론)이 끝나고 품종 이미지 파일이 모두 있어야 200"""
+    if warm_up_state["missing_images"]:
+        return JSONResponse(
+            content={"status": "failed", "error": "품종 이미지 파일이 없습니다.", "missing_images": warm_up_state["missing_images"]},
+            status_code=503
+        )
+    if warm_up_state["ready"]:
+        return {"status": "ready", "warm_up_seconds": warm_up_state["seconds"]}
+    if warm_up_state["error"]:
+        return JSONResponse(content={"status": "failed", "error": warm_up_state["error"]}, status_code=503)
+    return JSONResponse(content={"status": "warming_up"}, status_code=503)
+
+@app.get("/metrics")
+def get_metrics():
+    """Prometheus 텍스트 형식 지표"""
+    if not metrics.ENABLED:
+        return JSONResponse(content={"detail": "Not Found"}, status_code=404)
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="127.0.0.1", port=8000, reload=True)
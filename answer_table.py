@@ -0,0 +1,140 @@
+# answer_table.py
+# 5개 특징 × 5단계 = 3125가지 조합별 분석 결과(매칭/얼굴형 분석)를 미리 계산해 두는 표
+#
+# 특징 조합은 각 특징의 점수(1~5)를 5진수로 묶은 정수 키로 찾고,
+# 응답 JSON 조각도 함께 저장해 /analyze-face의 추론 이후 처리를 배열 조회 한 번으로 끝냄
+#
+# 검증 (저장소 루트에서):
+#   python answer_table.py --verify
+import json
+import threading
+
+
+def _dumps(value):
+    # JSONResponse와 같은 직렬화 형식
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+
+
+class AnswerTable:
+    def __init__(self, pet_type, matrix, face_analysis, top_n=3):
+        """matrix: BreedMatrix, face_analysis: get_face_analysis와 같은 (features, pet_type) → dict 함수"""
+        self.pet_type = pet_type
+        self.matrix = matrix
+        self.face_analysis = face_analysis
+        self.top_n = top_n
+        self.features = list(matrix.features)
+        # 특징별 값 → 0~4 단계 (FEATURE_SCORES 점수 - 1)
+        self._levels = [
+            {value: score - 1 for value, score in matrix.feature_scores[feature].items()}
+            for feature in self.features
+        ]
+        self._values = [
+            {level: value for value, level in levels.items()} for levels in self._levels
+        ]
+        self.size = 5 ** len(self.features)
+        self._lock = threading.Lock()
+        self._thumbnails = matrix.thumbnails
+        self._entries = [None] * self.size  # 키 → (결과 dict, JSON 조각 바이트)
+
+    def key(self, features):
+        """특징 dict → 5진수 정수 키, 표에 없는 형태(누락/알 수 없는 값/다른 순서)면 None"""
+        if len(features) != len(self.features):
+            return None
+        key = 0
+        for feature, levels, name in zip(self.features, self._levels, features):
+            # 응답의 human_features 순서까지 같아야 저장된 JSON 조각을 그대로 쓸 수 있음
+            if name != feature:
+                return None
+            level = levels.get(features[feature])
+            if level is None:
+                return None
+            key = key * 5 + level
+        return key
+
+    def decode(self, key):
+        """정수 키 → 특징 dict (표에 없는 단계는 None)"""
+        levels = []
+        for _ in self.features:
+            key, level = divmod(key, 5)
+            levels.append(level)
+        return {
+            feature: values.get(level)
+            for feature, values, level in zip(self.features, self._values, reversed(levels))
+        }
+
+    def compute(self, features):
+        """캐시를 거치지 않고 현재 함수로 결과 계산 → (결과 dict, JSON 조각 바이트)"""
+        result = {
+            "human_features": dict(features),
+            "face_analysis": self.face_analysis(features, pet_type=self.pet_type),
+            "matches": self.matrix.find_best_matches(features, top_n=self.top_n)
+        }
+        # 응답 객체의 {}를 뺀 "human_features":...,"face_analysis":...,"matches":... 조각
+        fragment = _dumps(result)[1:-1].encode("utf-8")
+        return result, fragment
+
+    def lookup(self, features):
+        """특징 dict → (결과 dict, JSON 조각), 표에 없는 형태면 None (처음 조회할 때 계산해서 저장)"""
+        key = self.key(features)
+        if key is None:
+            return None
+        if self.matrix.thumbnails is not self._thumbnails:
+            # 워밍업 후 썸네일이 추가되면 매칭 결과가 바뀌므로 다시 계산
+            self.clear()
+        entry = self._entries[key]
+        if entry is None:
+            entry = self.compute(features)
+            self._entries[key] = entry
+        return entry
+
+    def precompute(self):
+        """표현 가능한 모든 조합을 미리 계산 → 계산한 항목 수"""
+        count = 0
+        for key in range(self.size):
+            features = self.decode(key)
+            if None in features.values():
+                continue
+            self.lookup(features)
+            count += 1
+        return count
+
+    def verify(self):
+        """저장된 모든 항목을 현재 함수 결과와 비교 → 다른 키 목록"""
+        mismatches = []
+        for key, entry in enumerate(self._entries):
+            if entry is None:
+                continue
+            if self.compute(self.decode(key))[1] != entry[1]:
+                mismatches.append(key)
+        return mismatches
+
+    def clear(self):
+        with self._lock:
+            self._thumbnails = self.matrix.thumbnails
+            self._entries = [None] * self.size
+
+    def stats(self):
+        return {"size": self.size, "filled": sum(entry is not None for entry in self._entries)}
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="특징 조합별 분석 결과 표 생성/검증")
+    parser.add_argument("--verify", action="store_true", help="모든 조합을 미리 계산한 뒤 현재 함수 결과와 비교")
+    args = parser.parse_args()
+
+    import Main
+    failed = False
+    for pet_type, table in Main.ANSWER_TABLES.items():
+        count = table.precompute()
+        line = f"{pet_type}: {count}개 조합 계산"
+        if args.verify:
+            mismatches = table.verify()
+            failed = failed or bool(mismatches)
+            line += f", 불일치 {len(mismatches)}건"
+            for key in mismatches[:10]:
+                line += f"\n  {key}: {table.decode(key)}"
+        print(line)
+    sys.exit(1 if failed else 0)
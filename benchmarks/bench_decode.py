@@ -0,0 +1,149 @@
+# benchmarks/bench_decode.py
+# 원본 디코딩 vs 축소 디코딩(downscale-before-detect) 지연 시간/메모리 비교
+#
+# 사용법 (저장소 루트에서):
+#   python -m benchmarks.bench_decode <이미지 폴더> [--max-side 1024] [--repeat 5]
+#
+# 모드별로 별도 프로세스에서 실행해 최대 메모리(RSS)를 독립적으로 측정하고,
+# 두 모드의 얼굴 특징 분류 결과가 모두 같은지 확인함 (다르면 종료 코드 1)
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".bmp")
+
+
+def list_images(path):
+    if os.path.isfile(path):
+        return [path]
+    return sorted(
+        os.path.join(path, name) for name in os.listdir(path)
+        if name.lower().endswith(IMAGE_EXTENSIONS)
+    )
+
+
+def _rss_mb():
+    # 리눅스에서 ru_maxrss 단위는 KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_worker(paths, max_side, repeat):
+    """한 가지 모드로 모든 이미지를 처리하고 결과를 JSON으로 출력"""
+    import cv2
+    from face_mesh_pool import FaceMeshPool
+    from image_decode import decode_image
+    from Main import analyze_face_features
+
+    pool = FaceMeshPool(1)
+    blobs = [(path, open(path, "rb").read()) for path in paths]
+    base_rss = _rss_mb()
+
+    decode_ms = []
+    total_ms = []
+    features = {}
+    for _ in range(repeat):
+        for path, contents in blobs:
+            started = time.perf_counter()
+            image = decode_image(contents, max_side)
+            decoded = time.perf_counter()
+            if image is None:
+                features[path] = "decode_error"
+                continue
+            rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+            with pool.checkout() as face_mesh:
+                results = face_mesh.process(rgb_image)
+            if results.multi_face_landmarks:
+                features[path] = analyze_face_features(results.multi_face_landmarks[0].landmark)
+            else:
+                features[path] = "no_face"
+            finished = time.perf_counter()
+            decode_ms.append((decoded - started) * 1000)
+            total_ms.append((finished - started) * 1000)
+
+    json.dump({
+        "max_side": max_side,
+        "decode_ms": decode_ms,
+        "total_ms": total_ms,
+        "base_rss_mb": base_rss,
+        "peak_rss_mb": _rss_mb(),
+        "features": features,
+    }, sys.stdout)
+
+
+def _percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _run_mode(path, max_side, repeat):
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_decode", path,
+         "--max-side", str(max_side), "--repeat", str(repeat), "--worker"],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="원본 디코딩과 축소 디코딩의 지연 시간/메모리 비교")
+    parser.add_argument("path", help="이미지 파일 또는 폴더")
+    parser.add_argument("--max-side", type=int, default=1024)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    paths = list_images(args.path)
+    if args.worker:
+        run_worker(paths, args.max_side, args.repeat)
+        return
+
+    if not paths:
+        sys.exit(f"이미지를 찾을 수 없습니다: {args.path}")
+
+    results = {
+        "full": _run_mode(args.path, 0, args.repeat),
+        "fast": _run_mode(args.path, args.max_side, args.repeat),
+    }
+
+    print(f"images={len(paths)} repeat={args.repeat} max_side={args.max_side}")
+    print(f"{'mode':<6}{'decode p50':>12}{'decode p95':>12}{'total p50':>12}{'total p95':>12}{'peak RSS':>12}{'Δ RSS':>10}")
+    for mode, result in results.items():
+        print(
+            f"{mode:<6}"
+            f"{statistics.median(result['decode_ms'] or [0]):>10.1f}ms"
+            f"{_percentile(result['decode_ms'], 95):>10.1f}ms"
+            f"{statistics.median(result['total_ms'] or [0]):>10.1f}ms"
+            f"{_percentile(result['total_ms'], 95):>10.1f}ms"
+            f"{result['peak_rss_mb']:>10.1f}MB"
+            f"{result['peak_rss_mb'] - result['base_rss_mb']:>8.1f}MB"
+        )
+
+    mismatches = [
+        path for path in paths
+        if results["full"]["features"].get(path) != results["fast"]["features"].get(path)
+    ]
+    for path in mismatches:
+        print(f"특징 불일치: {path}")
+        print(f"  full: {results['full']['features'].get(path)}")
+        print(f"  fast: {results['fast']['features'].get(path)}")
+    print(f"특징 분류 일치: {len(paths) - len(mismatches)}/{len(paths)}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
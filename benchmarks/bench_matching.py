@@ -0,0 +1,102 @@
+# benchmarks/bench_matching.py
+# 품종 매칭: 전체 스캔(brute force) vs 특징 벡터 버킷 인덱스 질의 시간 비교
+#
+# 사용법 (저장소 루트에서):
+#   python -m benchmarks.bench_matching [--sizes 10 100 1000 10000 100000] [--queries 200] [--top-n 3]
+#
+# 카탈로그 크기별로 임의의 품종 데이터를 만들어 두 방식의 상위 N 결과(순서, 유사도)가
+# 모두 같은지 확인함 (다르면 종료 코드 1)
+import argparse
+import random
+import sys
+import time
+
+import numpy as np
+
+from breed_matrix import BreedMatrix, FEATURE_ORDER
+
+FEATURE_SCORES = {
+    "face_width": {"very_wide": 5, "wide": 4, "medium": 3, "narrow": 2, "very_narrow": 1},
+    "eye_shape": {"large": 5, "round": 4, "oval": 3, "narrow": 2, "very_narrow": 1},
+    "nose_size": {"very_large": 5, "large": 4, "medium": 3, "small": 2, "very_small": 1},
+    "mouth_width": {"very_wide": 5, "wide": 4, "medium": 3, "small": 2, "very_small": 1},
+    "face_length": {"very_long": 5, "long": 4, "medium": 3, "short": 2, "very_short": 1}
+}
+
+
+def random_features(rng, partial=False):
+    features = {}
+    for feature in FEATURE_ORDER:
+        if partial and rng.random() < 0.1:
+            continue
+        features[feature] = rng.choice(list(FEATURE_SCORES[feature]))
+    return features
+
+
+def make_catalog(rng, size):
+    return {
+        f"breed-{i}": {
+            "name": f"breed-{i}",
+            "description": "",
+            "personality": [],
+            "image": "",
+            "face_features": random_features(rng, partial=True)
+        }
+        for i in range(size)
+    }
+
+
+def brute_force(matrix, scores, present, top_n):
+    similarities = matrix.similarity_batch(scores, present)
+    results = []
+    for row in similarities:
+        indices = matrix.top_indices(row, top_n)
+        results.append((indices, row[indices]))
+    return results
+
+
+def _per_query_ms(fn, queries):
+    started = time.perf_counter()
+    results = fn()
+    return (time.perf_counter() - started) * 1000 / queries, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="품종 매칭 전체 스캔 vs 인덱스 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-n", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    query_features = [random_features(rng, partial=True) for _ in range(args.queries)]
+
+    mismatches = 0
+    print(f"{'breeds':>8} {'buckets':>8} {'brute ms/q':>11} {'index ms/q':>11} {'speedup':>8}")
+    for size in args.sizes:
+        matrix = BreedMatrix(make_catalog(rng, size), FEATURE_SCORES)
+        scores, present = matrix.encode_many(query_features)
+
+        # 질의를 하나씩 보내는 실제 API 사용 형태로 측정
+        brute_ms, brute = _per_query_ms(
+            lambda: [brute_force(matrix, scores[i:i + 1], present[i:i + 1], args.top_n)[0] for i in range(args.queries)],
+            args.queries
+        )
+        index_ms, indexed = _per_query_ms(
+            lambda: [matrix.rank_batch(scores[i:i + 1], present[i:i + 1], args.top_n)[0] for i in range(args.queries)],
+            args.queries
+        )
+        for (brute_indices, brute_values), (indices, values) in zip(brute, indexed):
+            if not (np.array_equal(brute_indices, indices) and np.array_equal(brute_values, values)):
+                mismatches += 1
+        print(f"{size:>8} {len(matrix.index):>8} {brute_ms:>11.3f} {index_ms:>11.3f} {brute_ms / index_ms:>7.1f}x")
+
+    if mismatches:
+        print(f"결과 불일치: {mismatches}건", file=sys.stderr)
+        sys.exit(1)
+    print("모든 질의에서 전체 스캔과 순위/유사도 일치")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# benchmarks/bench_multi_face.py
+# 여러 얼굴 모드 지연 시간: 사진 속 얼굴 수에 따른 증가폭 측정
+#
+# 사용법 (저장소 루트에서):
+#   python -m benchmarks.bench_multi_face [--image <얼굴 사진>] [--max-faces 6] [--repeat 5]
+#
+# 샘플 얼굴을 격자로 이어 붙여 얼굴 1~N명짜리 단체 사진을 만들고,
+# 한 번의 FaceMesh 실행(detect_faces) + 일괄 특징 분석 + 일괄 매칭 시간을 얼굴 수별로 보고함
+import argparse
+import math
+import os
+import statistics
+import time
+
+SAMPLE_IMAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "samples", "grace_hopper.jpg")
+
+
+def make_group_photo(face, count, columns=3):
+    """얼굴 사진을 count개 격자로 붙인 JPEG 바이트 (이미지 크기는 격자 칸 수에만 비례)"""
+    import cv2
+    import numpy as np
+
+    rows = math.ceil(count / columns)
+    height, width = face.shape[:2]
+    canvas = np.full((rows * height, min(count, columns) * width, 3), 255, dtype=np.uint8)
+    for i in range(count):
+        row, column = divmod(i, columns)
+        canvas[row * height:(row + 1) * height, column * width:(column + 1) * width] = face
+    ok, encoded = cv2.imencode(".jpg", canvas, [cv2.IMWRITE_JPEG_QUALITY, 90])
+    return encoded.tobytes()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="여러 얼굴 모드 지연 시간 벤치마크")
+    parser.add_argument("--image", default=SAMPLE_IMAGE)
+    parser.add_argument("--max-faces", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    import cv2
+    import numpy as np
+    import Main
+    from landmark_geometry import analyze_landmark_vectors
+
+    face = cv2.imread(args.image)
+    # 격자가 커져도 MAX_IMAGE_SIDE 축소 후 얼굴이 검출될 크기로 맞춤
+    face = cv2.resize(face, (256, round(256 * face.shape[0] / face.shape[1])), interpolation=cv2.INTER_AREA)
+
+    print(f"{'faces':>5} {'found':>5} {'detect ms':>10} {'features ms':>12} {'matching ms':>12} {'ms/face':>8}")
+    for count in range(1, args.max_faces + 1):
+        contents = make_group_photo(face, count)
+        detect_ms = []
+        features_ms = []
+        matching_ms = []
+        found = 0
+        for _ in range(args.repeat + 1):
+            started = time.perf_counter()
+            landmarks, aspect, _ = Main.detect_faces(contents, Main.settings.MAX_FACES)
+            detected = time.perf_counter()
+            features, vectors = analyze_landmark_vectors(landmarks, Main.NORMALIZE_MEASUREMENTS, aspect)
+            analyzed = time.perf_counter()
+            Main.match_faces(list(zip(features, vectors)), pet_type="dog", top_n=3)
+            matched = time.perf_counter()
+            detect_ms.append((detected - started) * 1000)
+            features_ms.append((analyzed - detected) * 1000)
+            matching_ms.append((matched - analyzed) * 1000)
+            found = len(landmarks)
+        # 첫 실행(그래프 생성 포함)은 제외
+        detect = statistics.median(detect_ms[1:])
+        feature = statistics.median(features_ms[1:])
+        matching = statistics.median(matching_ms[1:])
+        total = detect + feature + matching
+        print(f"{count:>5} {found:>5} {detect:>10.1f} {feature:>12.3f} {matching:>12.3f} {total / max(found, 1):>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
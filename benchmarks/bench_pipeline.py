@@ -0,0 +1,323 @@
+# benchmarks/bench_pipeline.py
+# /analyze-face 전체 파이프라인 벤치마크 (오프라인 실행 가능)
+#
+# 사용법 (저장소 루트에서):
+#   python -m benchmarks.bench_pipeline                       # 내장 샘플 얼굴 사용
+#   python -m benchmarks.bench_pipeline --images <폴더> --output results.json
+#   python -m benchmarks.bench_pipeline --compare before.json # 이전 결과와 비교
+#
+# 1) 단계별 지연 시간: decode / cvtColor / face_mesh / features / matching / analysis
+# 2) 동시 요청 수별 처리량: ASGI 앱을 같은 프로세스에서 직접 호출 (네트워크 없음)
+# 3) 최대 메모리(RSS)
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import uuid
+
+SAMPLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "samples")
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".bmp")
+# 내장 샘플을 여러 해상도로 늘려 크기별 비용이 섞이도록 함
+SYNTHETIC_SIDES = (480, 1024, 2048, 4096)
+
+
+def _rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def summarize(values):
+    """지연 시간 목록(ms) → 백분위수 요약"""
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+
+    def percentile(q):
+        return round(ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))], 3)
+
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 3),
+        "p50": percentile(50),
+        "p90": percentile(90),
+        "p99": percentile(99),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def load_images(path):
+    """(이름, 바이트) 목록, 폴더를 지정하지 않으면 내장 샘플로 여러 크기의 JPEG 생성"""
+    import cv2
+
+    if path:
+        names = sorted(n for n in os.listdir(path) if n.lower().endswith(IMAGE_EXTENSIONS))
+        return [(name, open(os.path.join(path, name), "rb").read()) for name in names]
+
+    images = []
+    for name in sorted(os.listdir(SAMPLES_DIR)):
+        if not name.lower().endswith(IMAGE_EXTENSIONS):
+            continue
+        image = cv2.imread(os.path.join(SAMPLES_DIR, name))
+        height, width = image.shape[:2]
+        for side in SYNTHETIC_SIDES:
+            scale = side / max(height, width)
+            resized = cv2.resize(image, (round(width * scale), round(height * scale)), interpolation=cv2.INTER_CUBIC)
+            ok, encoded = cv2.imencode(".jpg", resized, [cv2.IMWRITE_JPEG_QUALITY, 90])
+            images.append((f"{os.path.splitext(name)[0]}_{side}.jpg", encoded.tobytes()))
+    return images
+
+
+def bench_stages(images, repeat, pet_type):
+    """파이프라인 각 단계를 직접 호출해 단계별 지연 시간 측정"""
+    import cv2
+    import Main
+    from face_mesh_pool import checkout_face_mesh
+    from image_decode import decode_image
+    from landmark_geometry import landmarks_to_array
+
+    stages = {name: [] for name in ("decode", "cvtColor", "face_mesh", "features", "matching", "analysis", "total")}
+    no_face = 0
+    for _ in range(repeat):
+        for _, contents in images:
+            t0 = time.perf_counter()
+            image = decode_image(contents, Main.settings.MAX_IMAGE_SIDE)
+            t1 = time.perf_counter()
+            rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+            t2 = time.perf_counter()
+            with checkout_face_mesh() as face_mesh:
+                results = face_mesh.process(rgb_image)
+            t3 = time.perf_counter()
+            stages["decode"].append((t1 - t0) * 1000)
+            stages["cvtColor"].append((t2 - t1) * 1000)
+            stages["face_mesh"].append((t3 - t2) * 1000)
+            if not results.multi_face_landmarks:
+                no_face += 1
+                continue
+            features = Main.analyze_face_features(landmarks_to_array(results.multi_face_landmarks[0].landmark))
+            t4 = time.perf_counter()
+            Main.find_best_matches(features, pet_type=pet_type, top_n=3)
+            t5 = time.perf_counter()
+            Main.get_face_analysis(features, pet_type=pet_type)
+            t6 = time.perf_counter()
+            stages["features"].append((t4 - t3) * 1000)
+            stages["matching"].append((t5 - t4) * 1000)
+            stages["analysis"].append((t6 - t5) * 1000)
+            stages["total"].append((t6 - t0) * 1000)
+    return {"no_face": no_face, **{name: summarize(values) for name, values in stages.items()}}
+
+
+async def asgi_post(app, path, body, content_type):
+    """HTTP 서버 없이 ASGI 앱에 POST 요청을 보내고 상태 코드 반환"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path.split("?")[0],
+        "raw_path": path.split("?")[0].encode(),
+        "query_string": path.partition("?")[2].encode(),
+        "root_path": "",
+        "headers": [
+            (b"host", b"bench"),
+            (b"content-type", content_type.encode()),
+            (b"content-length", str(len(body)).encode()),
+        ],
+        "client": ("127.0.0.1", 0),
+        "server": ("bench", 80),
+    }
+    body_sent = False
+    finished = asyncio.Event()
+    status = None
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body" and not message.get("more_body"):
+            finished.set()
+
+    await app(scope, receive, send)
+    return status
+
+
+def multipart_body(filename, contents):
+    boundary = uuid.uuid4().hex
+    head = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        "Content-Type: image/jpeg\r\n\r\n"
+    ).encode()
+    return f"multipart/form-data; boundary={boundary}", head + contents + f"\r\n--{boundary}--\r\n".encode()
+
+
+async def bench_throughput(images, concurrency, requests, pet_type):
+    """동시 요청 수 concurrency로 requests건을 보내 처리량과 지연 시간 측정"""
+    import Main
+
+    bodies = [multipart_body(name, contents) for name, contents in images]
+    path = f"/analyze-face?pet_type={pet_type}"
+    latencies = []
+    statuses = {}
+    next_index = 0
+
+    async def client():
+        nonlocal next_index
+        while next_index < requests:
+            content_type, body = bodies[next_index % len(bodies)]
+            next_index += 1
+            started = time.perf_counter()
+            status = await asgi_post(Main.app, path, body, content_type)
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(requests / elapsed, 2),
+        "statuses": statuses,
+        "latency_ms": summarize(latencies),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def _flatten(result, prefix=""):
+    """비교용으로 숫자 지표만 'a.b.c' 형태로 펼침"""
+    flat = {}
+    for key, value in result.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, name + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(before, after):
+    """두 결과의 주요 지표 변화율 출력"""
+    old = _flatten({"stages": before["stages"], "memory": before["memory"]})
+    new = _flatten({"stages": after["stages"], "memory": after["memory"]})
+    for run in before["throughput"]:
+        old.update(_flatten(run, f"throughput.c{run['concurrency']}."))
+    for run in after["throughput"]:
+        new.update(_flatten(run, f"throughput.c{run['concurrency']}."))
+
+    print(f"\n비교: {before.get('commit')} → {after.get('commit')}")
+    for name in sorted(old.keys() & new.keys()):
+        if not any(part in name for part in ("p50", "p90", "p99", "mean", "requests_per_second", "_mb")):
+            continue
+        if old[name]:
+            change = (new[name] - old[name]) / old[name] * 100
+            print(f"  {name:<48}{old[name]:>12.3f}{new[name]:>12.3f}{change:>+9.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/analyze-face 파이프라인 벤치마크")
+    parser.add_argument("--images", help="이미지 폴더 (생략 시 내장 샘플을 여러 크기로 사용)")
+    parser.add_argument("--repeat", type=int, default=3, help="단계별 측정 반복 횟수")
+    parser.add_argument("--concurrency", default="1,2,4,8", help="처리량 측정 동시 요청 수 목록")
+    parser.add_argument("--requests", type=int, default=32, help="동시 요청 수별 전체 요청 수")
+    parser.add_argument("--pet-type", default="dog", choices=["dog", "cat"])
+    parser.add_argument("--cache", action="store_true", help="결과 캐시 사용 (기본: 비활성화)")
+    parser.add_argument("--output", help="결과를 저장할 JSON 파일 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON 파일 경로")
+    args = parser.parse_args()
+
+    if not args.cache:
+        # 같은 이미지를 반복해서 보내므로 캐시를 끄지 않으면 추론 비용이 측정되지 않음
+        os.environ["CACHE_MAX_ENTRIES"] = "0"
+
+    base_rss = _rss_mb()
+    import cv2
+    import mediapipe
+    import numpy
+    import Main
+
+    images = load_images(args.images)
+    if not images:
+        sys.exit("벤치마크할 이미지가 없습니다.")
+    import_rss = _rss_mb()
+
+    stages = bench_stages(images, args.repeat, args.pet_type)
+    stage_rss = _rss_mb()
+
+    throughput = [
+        asyncio.run(bench_throughput(images, int(level), args.requests, args.pet_type))
+        for level in args.concurrency.split(",")
+    ]
+    Main.inference_pool.shutdown()
+
+    result = {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "numpy": numpy.__version__,
+            "opencv": cv2.__version__,
+            "mediapipe": mediapipe.__version__,
+        },
+        "config": {
+            "images": len(images),
+            "repeat": args.repeat,
+            "cache": args.cache,
+            "workers": Main.inference_pool.workers,
+            "worker_mode": Main.inference_pool.mode,
+            "max_image_side": Main.settings.MAX_IMAGE_SIDE,
+        },
+        "stages": stages,
+        "throughput": throughput,
+        "memory": {
+            "baseline_rss_mb": round(base_rss, 1),
+            "after_import_rss_mb": round(import_rss, 1),
+            "after_stages_rss_mb": round(stage_rss, 1),
+            "peak_rss_mb": round(_rss_mb(), 1),
+        },
+    }
+
+    print(f"commit={result['commit']} images={len(images)} workers={Main.inference_pool.workers}")
+    print(f"{'stage':<12}{'mean':>10}{'p50':>10}{'p90':>10}{'p99':>10}  (ms)")
+    for name, summary in stages.items():
+        if isinstance(summary, dict) and summary.get("count"):
+            print(f"{name:<12}{summary['mean']:>10.3f}{summary['p50']:>10.3f}{summary['p90']:>10.3f}{summary['p99']:>10.3f}")
+    print(f"{'concurrency':<12}{'req/s':>10}{'p50':>10}{'p99':>10}  statuses")
+    for run in throughput:
+        latency = run["latency_ms"]
+        print(f"{run['concurrency']:<12}{run['requests_per_second']:>10.2f}{latency['p50']:>10.1f}{latency['p99']:>10.1f}  {run['statuses']}")
+    print(f"peak RSS: {result['memory']['peak_rss_mb']} MB")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# benchmarks/import_time.py
+# 서버 시작 비용 측정: `import Main` 시간(포트를 열기 전까지)과 백그라운드 워밍업 시간
+#
+# 사용법 (저장소 루트에서):
+#   python -m benchmarks.import_time [--top 15] [--runs 3]
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+_MEASURE = """
+import json, sys, time
+started = time.perf_counter()
+import Main
+imported = time.perf_counter()
+heavy = sorted(name for name in ("cv2", "mediapipe") if name in sys.modules)
+Main.warm_up()
+ready = time.perf_counter()
+Main.inference_pool.shutdown()
+print(json.dumps({"import_seconds": imported - started, "warm_up_seconds": ready - imported, "heavy_modules_at_import": heavy}))
+"""
+
+
+def import_profile():
+    """python -X importtime 결과 → [(누적 시간 us, 모듈 이름)] (누적 시간 내림차순)"""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import Main"],
+        capture_output=True, text=True, check=True
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), name.rstrip()))
+    return sorted(rows, reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="import Main 시간과 워밍업 시간 측정")
+    parser.add_argument("--top", type=int, default=15, help="출력할 모듈 수")
+    parser.add_argument("--runs", type=int, default=3, help="측정 반복 횟수")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    runs = []
+    for _ in range(args.runs):
+        output = subprocess.run(
+            [sys.executable, "-c", _MEASURE], capture_output=True, text=True, check=True
+        ).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+
+    import_seconds = statistics.median(run["import_seconds"] for run in runs)
+    warm_up_seconds = statistics.median(run["warm_up_seconds"] for run in runs)
+    print(f"import Main (포트 열기 전):   {import_seconds:.3f}s")
+    print(f"백그라운드 워밍업 (ready까지): {warm_up_seconds:.3f}s")
+    print(f"import 시점에 로드된 cv2/mediapipe: {runs[0]['heavy_modules_at_import'] or '없음'}")
+
+    profile = import_profile()
+    print(f"\n누적 import 시간 상위 {args.top}개")
+    for cumulative, name in profile[:args.top]:
+        print(f"{cumulative / 1000:>10.1f}ms  {name}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "import_seconds": import_seconds,
+                "warm_up_seconds": warm_up_seconds,
+                "runs": runs,
+                "top_modules": [{"module": name.strip(), "cumulative_ms": us / 1000} for us, name in profile[:args.top]],
+            }, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# breed_catalog.py
+# breeds.json → 프로세스당 한 번 만드는 읽기 전용 품종 카탈로그
+# (고정된 품종 레코드, 점수 행렬, 펫 종류/특징값 인덱스, 미리 직렬화한 /breeds 응답)
+import functools
+import json
+from types import MappingProxyType
+
+from breed_matrix import BreedMatrix, FEATURE_ORDER
+from precompressed import PrecompressedAsset
+
+REQUIRED_FIELDS = ("name", "description", "face_features", "personality", "image")
+
+
+def freeze(value):
+    """dict → MappingProxyType, list → tuple (재귀)"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def validate_catalog(data):
+    """카탈로그 데이터 형식 검사 (잘못된 값은 시작 시점에 ValueError)"""
+    feature_scores = data.get("feature_scores")
+    image_urls = data.get("image_urls")
+    pets = data.get("pets")
+    if not isinstance(feature_scores, dict) or not isinstance(image_urls, dict) or not isinstance(pets, dict) or not pets:
+        raise ValueError("breed catalog must have 'feature_scores', 'image_urls' and 'pets' objects")
+    for pet_type, breeds in pets.items():
+        if not isinstance(breeds, dict) or not breeds:
+            raise ValueError(f"breed catalog has no breeds for '{pet_type}'")
+        if not str(image_urls.get(pet_type, "")).endswith("/"):
+            raise ValueError(f"breed catalog has no image URL prefix for '{pet_type}'")
+        for key, info in breeds.items():
+            missing = [field for field in REQUIRED_FIELDS if field not in info]
+            if missing:
+                raise ValueError(f"{pet_type}/{key}: missing fields {missing}")
+            for feature, value in info["face_features"].items():
+                if value not in feature_scores.get(feature, {}):
+                    raise ValueError(f"{pet_type}/{key}: unknown {feature} value '{value}'")
+            # 선택 항목: 연속 매칭용 목표 점수 (FEATURE_SCORES와 같은 1~5 척도)
+            for feature, target in info.get("feature_targets", {}).items():
+                if feature not in feature_scores or not 1 <= target <= 5:
+                    raise ValueError(f"{pet_type}/{key}: invalid feature target {feature}={target}")
+
+
+class BreedCatalog:
+    def __init__(self, data):
+        validate_catalog(data)
+        self.feature_scores = freeze(data["feature_scores"])
+        self.pet_types = tuple(data["pets"])
+        # image는 파일명 그대로 두고, 정적 파일 URL은 image_url로 추가
+        self.breeds = MappingProxyType({
+            pet_type: freeze({
+                key: {**info, "image_url": data["image_urls"][pet_type] + info["image"]}
+                for key, info in breeds.items()
+            })
+            for pet_type, breeds in data["pets"].items()
+        })
+        self.matrices = MappingProxyType({
+            pet_type: BreedMatrix(breeds, self.feature_scores) for pet_type, breeds in self.breeds.items()
+        })
+
+        # by_feature[펫 종류][특징][값] → 해당 값을 가진 품종 키 (DB 순서)
+        by_feature = {}
+        for pet_type, breeds in self.breeds.items():
+            index = {feature: {} for feature in FEATURE_ORDER}
+            for key, info in breeds.items():
+                for feature, value in info["face_features"].items():
+                    index.setdefault(feature, {}).setdefault(value, []).append(key)
+            by_feature[pet_type] = freeze(index)
+        self.by_feature = MappingProxyType(by_feature)
+
+        self.thumbnails = MappingProxyType({})
+        self._breeds_assets = self._render_breeds()
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def find(self, pet_type, feature, value):
+        """특징값이 일치하는 품종 키 목록"""
+        return self.by_feature[pet_type].get(feature, MappingProxyType({})).get(value, ())
+
+    def set_thumbnails(self, thumbnails):
+        """원본 이미지 URL → 썸네일 정보 (워밍업 후 한 번 교체, /breeds 응답도 다시 직렬화)"""
+        self.thumbnails = MappingProxyType(dict(thumbnails))
+        for matrix in self.matrices.values():
+            matrix.thumbnails = self.thumbnails
+        self._breeds_assets = self._render_breeds()
+
+    def _breed_details(self, breeds):
+        details = {}
+        for key, info in breeds.items():
+            detail = {field: _thaw(item) for field, item in info.items()}
+            if info["image_url"] in self.thumbnails:
+                detail["thumbnail"] = dict(self.thumbnails[info["image_url"]])
+            details[key] = detail
+        return details
+
+    def _render_breeds(self):
+        """/breeds 응답 본문을 미리 직렬화 (JSONResponse와 같은 형식)"""
+        assets = {}
+        for pet_type, breeds in self.breeds.items():
+            body = json.dumps({
+                "type": pet_type,
+                "breeds": list(breeds.keys()),
+                "total_breeds": len(breeds),
+                "breed_details": self._breed_details(breeds)
+            }, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            # 워밍업 후 썸네일이 추가되면 내용이 바뀌므로 매번 ETag로 재검증
+            assets[pet_type] = PrecompressedAsset(body, "application/json", cache_control="no-cache")
+        return assets
+
+    def breeds_response(self, pet_type, headers):
+        return self._breeds_assets[pet_type].response(headers)
+
+
+@functools.lru_cache(maxsize=None)
+def load_catalog(path):
+    """경로별로 한 번만 로드 (Main과 dog_database가 같은 카탈로그를 공유)"""
+    return BreedCatalog.load(path)
+
+
+def _thaw(value):
+    if isinstance(value, MappingProxyType):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
@@ -0,0 +1,182 @@
+# breed_images.py
+# 품종 이미지 검증 + 결과 카드용 썸네일(WebP/JPEG) 생성
+#
+# 썸네일 파일 이름에 내용 해시를 넣어 URL이 바뀌지 않는 한 내용도 바뀌지 않으므로
+# 1년짜리 immutable 캐시 헤더로 제공함
+#
+# 오프라인 생성 (저장소 루트에서):
+#   python breed_images.py
+import hashlib
+import json
+import logging
+import os
+
+from fastapi.staticfiles import StaticFiles
+
+logger = logging.getLogger("pet_face")
+
+# 정적 URL 접두어 → 원본 이미지 폴더
+STATIC_DIRS = {
+    "/static/dogs/": "dog_image",
+    "/static/cats/": "cat_image",
+}
+
+THUMBNAIL_DIR = ".thumbnails"
+THUMBNAIL_URL = "/static/thumbs"
+MANIFEST_NAME = "manifest.json"
+
+# 결과 카드 이미지는 120px 정사각형 (object-fit: cover), 고해상도 화면용 2배 크기도 생성
+THUMBNAIL_SIZES = (120, 240)
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """내용 해시가 들어간 파일용 StaticFiles (장기 캐시 헤더 추가)"""
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+
+def resolve_image_path(url):
+    """"/static/dogs/x.png" → "dog_image/x.png", 알 수 없는 URL이면 None"""
+    for prefix, directory in STATIC_DIRS.items():
+        if url.startswith(prefix):
+            return os.path.join(directory, url[len(prefix):])
+    return None
+
+
+def validate_images(databases):
+    """모든 품종 이미지 파일이 실제로 있는지 확인 → 누락 목록 [(데이터베이스, 품종, 참조, 경로)]"""
+    missing = []
+    for label, breeds, resolve in databases:
+        for breed_name, info in breeds.items():
+            path = resolve(info["image_url"])
+            if path is None or not os.path.isfile(path):
+                missing.append((label, breed_name, info["image_url"], path))
+    for label, breed_name, image, path in missing:
+        logger.error(f"품종 이미지 파일 없음: {label}/{breed_name} → {image} ({path})")
+    return missing
+
+
+def _file_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _encode_variants(path):
+    """원본 이미지 → {(형식, 크기): 인코딩된 바이트}"""
+    import cv2
+    import numpy as np
+
+    image = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+    if image is None:
+        raise ValueError(f"이미지를 읽을 수 없습니다: {path}")
+    if image.ndim == 2:
+        image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+    elif image.shape[2] == 4:
+        # 투명 배경은 흰색으로 합성 (JPEG는 알파 채널이 없음)
+        alpha = image[:, :, 3:4].astype(np.float32) / 255.0
+        image = (image[:, :, :3].astype(np.float32) * alpha + 255.0 * (1.0 - alpha)).astype(np.uint8)
+
+    variants = {}
+    height, width = image.shape[:2]
+    for size in THUMBNAIL_SIZES:
+        # 짧은 변을 size에 맞춤 (카드에서 object-fit: cover로 잘라서 표시)
+        scale = min(1.0, size / min(height, width))
+        resized = image if scale == 1.0 else cv2.resize(
+            image, (max(1, round(width * scale)), max(1, round(height * scale))), interpolation=cv2.INTER_AREA
+        )
+        ok, webp = cv2.imencode(".webp", resized, [cv2.IMWRITE_WEBP_QUALITY, 80])
+        if ok:
+            variants[("webp", size)] = webp.tobytes()
+        ok, jpeg = cv2.imencode(".jpg", resized, [cv2.IMWRITE_JPEG_QUALITY, 85, cv2.IMWRITE_JPEG_PROGRESSIVE, 1])
+        if ok:
+            variants[("jpeg", size)] = jpeg.tobytes()
+    return variants
+
+
+def build_thumbnails(image_urls, output_dir=THUMBNAIL_DIR):
+    """원본 이미지 URL 목록 → {원본 URL: 썸네일 정보}
+
+    원본이 바뀌지 않았으면 이전 manifest를 그대로 사용하므로 재시작 비용이 거의 없음
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+
+    thumbnails = {}
+    changed = False
+    for url in sorted(set(image_urls)):
+        path = resolve_image_path(url)
+        if path is None or not os.path.isfile(path):
+            continue
+        digest = _file_digest(path)
+        entry = manifest.get(url)
+        if entry is None or entry.get("source_sha256") != digest or not all(
+            os.path.isfile(os.path.join(output_dir, name)) for name in entry["files"]
+        ):
+            try:
+                variants = _encode_variants(path)
+            except ValueError as e:
+                logger.warning(str(e))
+                continue
+            stem = os.path.splitext(os.path.basename(path))[0]
+            files = {}
+            for (fmt, size), data in variants.items():
+                content_hash = hashlib.sha256(data).hexdigest()[:12]
+                extension = "webp" if fmt == "webp" else "jpg"
+                name = f"{stem}-{size}.{content_hash}.{extension}"
+                with open(os.path.join(output_dir, name), "wb") as f:
+                    f.write(data)
+                files[name] = {"format": fmt, "size": size}
+            entry = {"source_sha256": digest, "files": files}
+            manifest[url] = entry
+            changed = True
+
+        thumbnails[url] = _thumbnail_info(entry)
+
+    if changed:
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return thumbnails
+
+
+def _thumbnail_info(entry):
+    """manifest 항목 → 응답에 넣을 썸네일 정보 (srcset 형식)"""
+    by_format = {}
+    for name, meta in entry["files"].items():
+        by_format.setdefault(meta["format"], []).append((meta["size"], f"{THUMBNAIL_URL}/{name}"))
+    info = {}
+    for fmt, items in by_format.items():
+        items.sort()
+        base = items[0][0]
+        info[fmt] = ", ".join(f"{url} {size // base}x" for size, url in items)
+        if fmt == "jpeg":
+            info["src"] = items[0][1]
+    return info
+
+
+def breed_thumbnails(breed_databases, output_dir=THUMBNAIL_DIR):
+    """품종 데이터베이스들의 원본 이미지 → {원본 URL: 썸네일 정보} (원본 이미지가 없는 품종은 제외)"""
+    urls = [info["image_url"] for breeds in breed_databases for info in breeds.values()]
+    thumbnails = build_thumbnails(urls, output_dir)
+    # 프론트엔드는 webp/jpeg 두 형식이 모두 있을 때만 <picture>를 사용
+    return {
+        url: thumbnail for url, thumbnail in thumbnails.items()
+        if "webp" in thumbnail and "jpeg" in thumbnail
+    }
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    import settings
+    from breed_catalog import load_catalog
+    catalog = load_catalog(settings.BREED_CATALOG_PATH)
+    result = breed_thumbnails(catalog.breeds.values())
+    print(f"썸네일 생성 완료: {len(result)}개 원본 이미지 → {THUMBNAIL_DIR}/")
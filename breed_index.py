@@ -0,0 +1,65 @@
+# breed_index.py
+# 같은 특징 벡터를 가진 품종을 한 버킷으로 묶어 검색하는 정확한(exact) 인덱스
+#
+# 특징은 5개 × (점수 1~5 또는 미정의) 이므로 서로 다른 벡터는 최대 6^5 = 7776개.
+# 질의는 품종 수가 아니라 버킷 수에 비례하므로 품종이 수천~수십만 개여도 비용이 거의 늘지 않음.
+# 같은 벡터는 유사도도 같으므로 전체 스캔 + 안정 정렬과 순위/유사도 값이 완전히 같음.
+import numpy as np
+
+
+class SignatureIndex:
+    def __init__(self, scores, present):
+        signatures = np.concatenate([scores, present.astype(np.float64)], axis=1)
+        unique, first, inverse = np.unique(signatures, axis=0, return_index=True, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        feature_count = scores.shape[1]
+
+        # 버킷 순서는 첫 번째 품종의 DB 순서 → 동점 버킷을 합칠 때 병합 비용이 작음
+        bucket_order = np.argsort(first, kind="stable")
+        remap = np.empty_like(bucket_order)
+        remap[bucket_order] = np.arange(len(bucket_order))
+        inverse = remap[inverse]
+        unique = unique[bucket_order]
+
+        self.scores = unique[:, :feature_count]
+        self.present = unique[:, feature_count:].astype(bool)
+        # members[k]: k번째 버킷에 속한 품종 인덱스 (DB 순서)
+        order = np.argsort(inverse, kind="stable")
+        counts = np.bincount(inverse, minlength=len(unique))
+        self.members = np.split(order, np.cumsum(counts)[:-1])
+        self.size = len(inverse)
+
+    def __len__(self):
+        return len(self.members)
+
+    def top(self, bucket_similarities, top_n):
+        """버킷별 유사도 → (상위 top_n 품종 인덱스, 유사도), 동점이면 DB 순서"""
+        if top_n <= 0 or self.size == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float64)
+        count = len(bucket_similarities)
+        if top_n < count:
+            # 버킷마다 품종이 1개 이상이므로 상위 top_n 버킷의 최솟값 이상인 버킷만 보면 충분
+            kth = np.argpartition(-bucket_similarities, top_n - 1)[:top_n]
+            candidates = np.flatnonzero(bucket_similarities >= bucket_similarities[kth].min())
+        else:
+            candidates = np.arange(count)
+        order = candidates[np.argsort(-bucket_similarities[candidates], kind="stable")]
+        indices = []
+        values = []
+        position = 0
+        while position < len(order) and len(indices) < top_n:
+            value = bucket_similarities[order[position]]
+            end = position + 1
+            while end < len(order) and bucket_similarities[order[end]] == value:
+                end += 1
+            # 유사도가 같은 버킷들은 품종 인덱스 순으로 합쳐서 자름
+            tied = order[position:end]
+            if len(tied) == 1:
+                members = self.members[tied[0]]
+            else:
+                members = np.sort(np.concatenate([self.members[k] for k in tied]))
+            taken = members[:top_n - len(indices)]
+            indices.extend(taken.tolist())
+            values.extend([value] * len(taken))
+            position = end
+        return np.array(indices, dtype=np.intp), np.array(values, dtype=np.float64)
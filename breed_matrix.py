@@ -0,0 +1,169 @@
+# breed_matrix.py
+# 품종 데이터베이스를 (품종 × 특징) 점수 행렬로 미리 변환해 두고 벡터 연산으로 매칭
+import numpy as np
+
+from breed_index import SignatureIndex
+from landmark_geometry import VECTOR_FEATURES
+
+FEATURE_ORDER = ["face_width", "eye_shape", "nose_size", "mouth_width", "face_length"]
+
+FEATURE_WEIGHTS = {
+    "face_width": 0.25,
+    "eye_shape": 0.25,
+    "nose_size": 0.2,
+    "mouth_width": 0.15,
+    "face_length": 0.15
+}
+
+FEATURE_NAMES = {
+    "face_width": "얼굴 너비",
+    "eye_shape": "눈 모양",
+    "nose_size": "코 크기",
+    "mouth_width": "입 크기",
+    "face_length": "얼굴 길이"
+}
+
+# 점수표에 없는 값은 중간값(3)으로 취급
+DEFAULT_SCORE = 3
+MAX_SCORE = 5
+
+
+class BreedMatrix:
+    def __init__(self, breeds, feature_scores, weights=FEATURE_WEIGHTS):
+        self.feature_scores = feature_scores
+        self.features = [feature for feature in weights]
+        self.weights = np.array([weights[feature] for feature in self.features], dtype=np.float64)
+
+        self.names = list(breeds.keys())
+        self.infos = [breeds[name] for name in self.names]
+        # scores[i, j]: i번째 품종의 j번째 특징 점수, present[i, j]: 해당 특징 정의 여부
+        self.scores, self.present = self.encode_many([info["face_features"] for info in self.infos])
+        # 같은 특징 벡터끼리 묶은 검색 인덱스 (품종 수가 많아도 버킷 수만큼만 계산)
+        self.index = SignatureIndex(self.scores, self.present)
+
+        # 연속 매칭용 품종 목표 벡터: "feature_targets"(1~5 실수)가 있으면 사용, 없으면 버킷 점수
+        self.targets = self.scores.copy()
+        target_present = self.present.copy()
+        for i, info in enumerate(self.infos):
+            for j, feature in enumerate(self.features):
+                if feature in info.get("feature_targets", {}):
+                    self.targets[i, j] = info["feature_targets"][feature]
+                    target_present[i, j] = True
+        if np.array_equal(self.targets, self.scores) and np.array_equal(target_present, self.present):
+            self.target_index = self.index
+        else:
+            self.target_index = SignatureIndex(self.targets, target_present)
+        # 연속 특징 벡터(VECTOR_FEATURES 순서) → self.features 순서
+        self._vector_columns = np.array([VECTOR_FEATURES.index(feature) for feature in self.features], dtype=np.intp)
+
+        # 원본 이미지 URL → 썸네일 정보 (워밍업 후 채워짐)
+        self.thumbnails = {}
+
+    def encode(self, features):
+        """특징 dict → (점수 벡터, 정의 여부 벡터)"""
+        scores = np.full(len(self.features), DEFAULT_SCORE, dtype=np.float64)
+        present = np.zeros(len(self.features), dtype=bool)
+        for j, feature in enumerate(self.features):
+            if feature in features:
+                scores[j] = self.feature_scores.get(feature, {}).get(features[feature], DEFAULT_SCORE)
+                present[j] = True
+        return scores, present
+
+    def encode_many(self, features_list):
+        encoded = [self.encode(features) for features in features_list]
+        scores = np.array([scores for scores, _ in encoded], dtype=np.float64).reshape(-1, len(self.features))
+        present = np.array([present for _, present in encoded], dtype=bool).reshape(-1, len(self.features))
+        return scores, present
+
+    def similarity_batch(self, human_scores, human_present, scores=None, present=None):
+        """(Q, F) 질의 → (Q, B) 유사도(0~100), 특징별 max(0, 5 - 점수 차이)의 가중 평균"""
+        if scores is None:
+            scores, present = self.scores, self.present
+        valid = human_present[:, None, :] & present[None, :, :]
+        diff = np.abs(human_scores[:, None, :] - scores[None, :, :])
+        weighted = np.where(valid, np.maximum(0, MAX_SCORE - diff) * self.weights, 0.0)
+        max_possible = np.where(valid, MAX_SCORE * self.weights, 0.0)
+
+        total_score = weighted.sum(axis=2)
+        max_possible_score = max_possible.sum(axis=2)
+        safe = np.where(max_possible_score > 0, max_possible_score, 1.0)
+        return np.where(max_possible_score > 0, total_score / safe * 100, 0.0)
+
+    def similarity(self, human_features):
+        scores, present = self.encode(human_features)
+        return self.similarity_batch(scores[None, :], present[None, :])[0]
+
+    @staticmethod
+    def top_indices(similarities, top_n):
+        """유사도 상위 top_n 인덱스 (동점이면 데이터베이스 순서, 기존 안정 정렬과 동일)"""
+        count = len(similarities)
+        if top_n <= 0 or count == 0:
+            return np.empty(0, dtype=np.intp)
+        if top_n < count:
+            # argpartition으로 top_n 경계값만 구한 뒤, 경계값과 동점인 후보까지 포함
+            kth = np.argpartition(-similarities, top_n - 1)[:top_n]
+            candidates = np.flatnonzero(similarities >= similarities[kth].min())
+        else:
+            candidates = np.arange(count)
+        order = np.lexsort((candidates, -similarities[candidates]))
+        return candidates[order][:top_n]
+
+    def matching_features(self, human_features, index):
+        pet_features = self.infos[index]["face_features"]
+        return [
+            FEATURE_NAMES.get(feature, feature)
+            for feature, human_value in human_features.items()
+            if feature in pet_features and human_value == pet_features[feature]
+        ]
+
+    def rank_batch(self, human_scores, human_present, top_n, index=None):
+        """질의별 (상위 top_n 품종 인덱스, 유사도), top_indices(similarity_batch(...))와 같은 결과"""
+        index = index or self.index
+        bucket_similarities = self.similarity_batch(human_scores, human_present, index.scores, index.present)
+        return [index.top(row, top_n) for row in bucket_similarities]
+
+    def _build_matches(self, human_features, indices, similarities):
+        matches = []
+        for index, similarity in zip(indices, similarities):
+            info = self.infos[index]
+            match = {
+                "breed": self.names[index],
+                "similarity": float(similarity),
+                "description": info["description"],
+                "personality": list(info["personality"]),
+                "image": info["image"],
+                "matching_features": self.matching_features(human_features, index)
+            }
+            # 카탈로그 품종은 정적 파일 URL과 썸네일도 포함
+            image_url = info.get("image_url")
+            if image_url is not None:
+                match["image_url"] = image_url
+                thumbnail = self.thumbnails.get(image_url)
+                if thumbnail is not None:
+                    match["thumbnail"] = thumbnail
+            matches.append(match)
+        return matches
+
+    def find_best_matches(self, human_features, top_n=3):
+        return self.find_best_matches_batch([human_features], top_n)[0]
+
+    def find_best_matches_vectors(self, human_features_list, vectors, top_n=3):
+        """연속 특징 점수 (Q, 5) → 매칭 결과, 품종 목표 벡터와의 가중 거리로 순위 (동점이 거의 없음)"""
+        scores = np.asarray(vectors, dtype=np.float64).reshape(-1, len(VECTOR_FEATURES))[:, self._vector_columns]
+        present = np.ones(scores.shape, dtype=bool)
+        return [
+            self._build_matches(human_features, indices, similarities)
+            for human_features, (indices, similarities) in zip(
+                human_features_list, self.rank_batch(scores, present, top_n, self.target_index)
+            )
+        ]
+
+    def find_best_matches_batch(self, human_features_list, top_n=3):
+        """여러 얼굴을 한 번의 행렬 연산으로 매칭"""
+        scores, present = self.encode_many(human_features_list)
+        return [
+            self._build_matches(human_features, indices, similarities)
+            for human_features, (indices, similarities) in zip(
+                human_features_list, self.rank_batch(scores, present, top_n)
+            )
+        ]
@@ -0,0 +1,172 @@
+# bulk_analyze.py
+# 이미지 폴더(또는 목록 파일)를 HTTP 서버 없이 한꺼번에 분석해서 JSONL로 저장
+#
+# 사용법 (저장소 루트에서):
+#   python bulk_analyze.py <이미지 폴더> -o results.jsonl [--pet-type dog] [--workers 8]
+#   python bulk_analyze.py --manifest images.txt -o results.jsonl
+#   python bulk_analyze.py <이미지 폴더> -o results.jsonl --resume   # 중단된 작업 이어서 실행
+#
+# 프로세스마다 FaceMesh 그래프 1개로 디코딩 + 랜드마크 검출을 하고,
+# 매칭/분석은 /analyze-face와 같은 코드(Main.build_analysis)로 메인 프로세스에서 실행
+# 결과는 끝나는 순서대로 한 줄씩 기록하며, 출력 파일 자체가 체크포인트 (--resume 시 이미 기록된 경로는 건너뜀)
+import argparse
+import json
+import os
+import signal
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import face_mesh_pool
+import settings
+from inference_pool import FaceNotFoundError, ImageDecodeError
+
+
+def _init_worker(graph_options):
+    # Ctrl+C는 메인 프로세스에서만 처리 (워커는 남은 작업 취소로 정리됨)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # 워커 프로세스마다 그래프 1개짜리 풀을 미리 생성
+    face_mesh_pool.configure(1, **graph_options)
+    face_mesh_pool.warm_up()
+
+
+def _analyze_file(path, full_path):
+    """워커에서 실행: 파일 읽기 + 디코딩 + 랜드마크 검출 + 특징 분석 → (경로, 특징, 연속 특징 벡터, 실패 사유)"""
+    import Main
+
+    try:
+        with open(full_path, "rb") as f:
+            contents = f.read()
+    except OSError as e:
+        return path, None, None, f"read_error: {e}"
+    try:
+        _, _, human_features, feature_vector, _ = Main.detect_face_features(contents)
+    except ImageDecodeError:
+        return path, None, None, "decode_error"
+    except FaceNotFoundError:
+        return path, None, None, "no_face"
+    except Exception as e:
+        return path, None, None, f"error: {e}"
+    return path, human_features, feature_vector, None
+
+
+def list_directory(root, extensions):
+    """폴더 아래 이미지 파일 → [(기록용 상대 경로, 실제 경로)] (이름순)"""
+    entries = []
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if filename.lower().endswith(extensions) and not filename.startswith("."):
+                full_path = os.path.join(directory, filename)
+                entries.append((os.path.relpath(full_path, root).replace(os.sep, "/"), full_path))
+    return entries
+
+
+def read_manifest(manifest):
+    """목록 파일 (한 줄에 경로 하나, 빈 줄/# 주석 무시, 상대 경로는 목록 파일 기준) → [(기록용 경로, 실제 경로)]"""
+    base = os.path.dirname(os.path.abspath(manifest))
+    entries = []
+    with open(manifest, encoding="utf-8") as f:
+        for line in f:
+            path = line.strip()
+            if path and not path.startswith("#"):
+                entries.append((path, os.path.join(base, path)))
+    return entries
+
+
+def load_checkpoint(output):
+    """기존 출력 파일에서 완료된 경로 집합을 읽고, 중단으로 잘린 마지막 줄은 잘라냄"""
+    done = set()
+    if not os.path.exists(output):
+        return done
+    with open(output, "rb+") as f:
+        valid_end = 0
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                done.add(json.loads(line)["path"])
+            except (ValueError, KeyError):
+                break
+            valid_end += len(line)
+        f.truncate(valid_end)
+    return done
+
+
+def main():
+    parser = argparse.ArgumentParser(description="이미지 폴더 일괄 분석 (JSONL 출력)")
+    parser.add_argument("directory", nargs="?", help="이미지 폴더 (하위 폴더 포함)")
+    parser.add_argument("--manifest", help="분석할 이미지 경로 목록 파일 (폴더 대신 사용)")
+    parser.add_argument("-o", "--output", required=True, help="결과 JSONL 파일")
+    parser.add_argument("--pet-type", choices=("dog", "cat"), default="dog")
+    parser.add_argument("--workers", type=int, default=settings.INFERENCE_WORKERS, help="워커 프로세스 수")
+    parser.add_argument("--resume", action="store_true", help="출력 파일에 이미 있는 이미지는 건너뜀")
+    parser.add_argument("--progress-seconds", type=float, default=5.0, help="진행 상황 출력 간격 (초)")
+    args = parser.parse_args()
+
+    if bool(args.directory) == bool(args.manifest):
+        parser.error("이미지 폴더와 --manifest 중 하나만 지정하세요")
+    if os.path.exists(args.output) and not args.resume:
+        parser.error(f"{args.output} 파일이 이미 있습니다 (이어서 실행하려면 --resume)")
+
+    import Main
+
+    entries = read_manifest(args.manifest) if args.manifest else list_directory(args.directory, Main.IMAGE_EXTENSIONS)
+    done = load_checkpoint(args.output) if args.resume else set()
+    pending = [(path, full_path) for path, full_path in entries if path not in done]
+    print(f"이미지 {len(entries)}개 중 {len(entries) - len(pending)}개 완료됨, {len(pending)}개 분석 시작", file=sys.stderr)
+
+    graph_options = {"refine_landmarks": settings.REFINE_LANDMARKS, "detector": settings.FACE_PIPELINE == "detector"}
+    workers = max(1, args.workers)
+    succeeded = failed = 0
+    interrupted = False
+    started = last_report = time.perf_counter()
+
+    with open(args.output, "a", encoding="utf-8") as out, ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(graph_options,)
+    ) as executor:
+        queue = iter(pending)
+        in_flight = set()
+        try:
+            while True:
+                # 제출해 둔 작업 수를 제한해서 목록이 커도 메모리 사용량이 일정하게 유지되도록 함
+                for path, full_path in queue:
+                    in_flight.add(executor.submit(_analyze_file, path, full_path))
+                    if len(in_flight) >= workers * 4:
+                        break
+                if not in_flight:
+                    break
+                completed, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    path, human_features, feature_vector, error = future.result()
+                    if error is None:
+                        record = {"path": path, "success": True, "pet_type": args.pet_type,
+                                  **Main.build_analysis(human_features, args.pet_type, feature_vector=feature_vector)}
+                        succeeded += 1
+                    else:
+                        record = {"path": path, "success": False, "error": error}
+                        failed += 1
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+
+                now = time.perf_counter()
+                if now - last_report >= args.progress_seconds:
+                    last_report = now
+                    processed = succeeded + failed
+                    print(f"{processed}/{len(pending)} ({processed / (now - started):.1f} images/s)", file=sys.stderr)
+        except KeyboardInterrupt:
+            # 이미 기록된 결과는 그대로 두고, 남은 작업은 취소
+            executor.shutdown(wait=False, cancel_futures=True)
+            interrupted = True
+
+    elapsed = time.perf_counter() - started
+    processed = succeeded + failed
+    rate = processed / elapsed if elapsed > 0 else 0.0
+    print(f"완료: {processed}개 (성공 {succeeded}, 실패 {failed}), {elapsed:.1f}초, {rate:.1f} images/s", file=sys.stderr)
+    if interrupted:
+        print("중단됨: 같은 명령에 --resume을 붙이면 이어서 실행합니다", file=sys.stderr)
+        sys.exit(130)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 # dog_matcher.py
 from dog_database import DOG_BREEDS, FEATURE_SCORES
+from breed_matrix import BreedMatrix
 
 class DogMatcher:
     def __init__(self):
@@ -10,72 +11,20 @@ class DogMatcher:
             "mouth_width": 0.15,
             "face_length": 0.15
         }
+        # 품종 데이터베이스를 점수 행렬로 한 번만 변환
+        self.breed_matrix = BreedMatrix(DOG_BREEDS, FEATURE_SCORES, self.feature_weights)
     
     def calculate_similarity(self, human_features, dog_features):
-        """사람과 강아지 특징 간 유사도 계산"""
-        total_score = 0
-        max_possible_score = 0
-        
-        for feature, weight in self.feature_weights.items():
-            if feature in human_features and feature in dog_features:
-                human_value = human_features[feature]
-                dog_value = dog_features[feature]
-                
-                # 특징값을 숫자로 변환
-                human_score = FEATURE_SCORES.get(feature, {}).get(human_value, 3)
-                dog_score = FEATURE_SCORES.get(feature, {}).get(dog_value, 3)
-                
-                # 차이가 적을수록 높은 점수
-                diff = abs(human_score - dog_score)
-                similarity = max(0, 5 - diff)  # 0~5 점수
-                
-                total_score += similarity * weight
-                max_possible_score += 5 * weight
-        
-        # 0~100 퍼센트로 변환
-        if max_possible_score > 0:
-            return (total_score / max_possible_score) * 100
-        return 0
+        """사람과 강아지 특징 간 유사도 계산 (0~100, 품종 매칭과 같은 BreedMatrix 계산)"""
+        human_scores, human_present = self.breed_matrix.encode(human_features)
+        dog_scores, dog_present = self.breed_matrix.encode(dog_features)
+        return float(self.breed_matrix.similarity_batch(
+            human_scores[None, :], human_present[None, :], dog_scores[None, :], dog_present[None, :]
+        )[0, 0])
     
     def find_best_matches(self, human_features, top_n=3):
         """가장 닮은 강아지 품종들을 찾기"""
-        matches = []
-        
-        for breed_name, breed_info in DOG_BREEDS.items():
-            dog_features = breed_info["face_features"]
-            similarity = self.calculate_similarity(human_features, dog_features)
-            
-            matches.append({
-                "breed": breed_name,
-                "similarity": similarity,
-                "description": breed_info["description"],
-                "personality": breed_info["personality"],
-                "image": breed_info["image"],
-                "matching_features": self._get_matching_features(human_features, dog_features)
-            })
-        
-        # 유사도 순으로 정렬
-        matches.sort(key=lambda x: x["similarity"], reverse=True)
-        return matches[:top_n]
-    
-    def _get_matching_features(self, human_features, dog_features):
-        """일치하는 특징들 찾기"""
-        matching = []
-        feature_names = {
-            "face_width": "얼굴 너비",
-            "eye_shape": "눈 모양",
-            "nose_size": "코 크기",
-            "mouth_width": "입 크기",
-            "face_length": "얼굴 길이"
-        }
-        
-        for feature, human_value in human_features.items():
-            if feature in dog_features:
-                dog_value = dog_features[feature]
-                if human_value == dog_value:
-                    matching.append(feature_names.get(feature, feature))
-        
-        return matching
+        return self.breed_matrix.find_best_matches(human_features, top_n=top_n)
     
     def get_detailed_analysis(self, human_features):
         """상세한 얼굴 분석 결과 제공"""
@@ -0,0 +1,57 @@
+# face_detection.py
+# 검출기 우선 파이프라인: 축소한 프레임에서 얼굴 영역을 찾고 그 부분만 잘라 FaceMesh 실행
+#
+# 얼굴이 없는 이미지는 FaceMesh 전에 바로 거절하고, 얼굴이 있으면 작은 영역만 랜드마크 계산.
+# 잘라낸 영역의 랜드마크는 원본 프레임 기준 정규화 좌표로 되돌려서 이후 측정은 기존과 같음
+import numpy as np
+
+from image_decode import downscale
+
+# 검출기 입력 프레임의 긴 변 (근거리 BlazeFace 입력이 128px이므로 이 이상은 이득이 거의 없음)
+DETECTOR_MAX_SIDE = 320
+
+# 검출 영역 바깥으로 더 잘라낼 비율 (검출 영역은 눈~입 위주라 이마/턱/볼 윤곽이 빠지지 않도록 넉넉히)
+CROP_MARGIN = 0.6
+
+
+def detect_regions(rgb_image, detector, max_side=DETECTOR_MAX_SIDE):
+    """RGB 이미지 → 검출 점수 높은 순 [(점수, [x_min, y_min, x_max, y_max] 정규화 좌표)]"""
+    results = detector.process(downscale(rgb_image, max_side))
+    regions = []
+    for detection in results.detections or []:
+        box = detection.location_data.relative_bounding_box
+        regions.append((
+            float(detection.score[0]),
+            [box.xmin, box.ymin, box.xmin + box.width, box.ymin + box.height]
+        ))
+    regions.sort(key=lambda region: -region[0])
+    return regions
+
+
+def crop_region(image, box, margin=CROP_MARGIN):
+    """정규화 좌표 영역 → 여백을 더한 정사각형 잘라낸 이미지와 (left, top, width, height) 픽셀 영역"""
+    height, width = image.shape[:2]
+    x_min, y_min, x_max, y_max = box
+    center_x = (x_min + x_max) / 2 * width
+    center_y = (y_min + y_max) / 2 * height
+    side = max((x_max - x_min) * width, (y_max - y_min) * height) * (1 + 2 * margin)
+
+    left = int(max(0, round(center_x - side / 2)))
+    top = int(max(0, round(center_y - side / 2)))
+    right = int(min(width, round(center_x + side / 2)))
+    bottom = int(min(height, round(center_y + side / 2)))
+    # FaceMesh 입력은 연속 배열이어야 함
+    crop = np.ascontiguousarray(image[top:bottom, left:right])
+    return crop, (left, top, right - left, bottom - top)
+
+
+def remap_landmarks(points, region, image_shape):
+    """잘라낸 영역 기준 정규화 랜드마크 (L, 3) → 원본 프레임 기준 정규화 좌표"""
+    left, top, crop_width, crop_height = region
+    height, width = image_shape[:2]
+    points = np.array(points, dtype=np.float32)
+    points[:, 0] = (left + points[:, 0] * crop_width) / width
+    points[:, 1] = (top + points[:, 1] * crop_height) / height
+    # z는 x와 같은 척도 (잘라낸 영역 폭 → 원본 폭)
+    points[:, 2] *= crop_width / width
+    return points
@@ -0,0 +1,167 @@
+# face_mesh_pool.py
+# 미리 만들어 둔 FaceMesh 그래프를 빌려 쓰고 반납하는 풀
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+
+def create_face_mesh(max_num_faces=1, refine_landmarks=True, static_image_mode=True):
+    """FaceMesh 그래프 생성 (기본: 정적 이미지용)
+
+    refine_landmarks=False면 눈동자(iris) 10점을 빼고 468점만 계산 (측정에 쓰는 점은 모두 468개 안에 있음)
+    static_image_mode=False면 영상용 추적 모드 (이전 프레임 얼굴 위치를 이어받아 검출기를 매번 돌리지 않음)
+    """
+    import mediapipe as mp
+    return mp.solutions.face_mesh.FaceMesh(
+        static_image_mode=static_image_mode,
+        max_num_faces=max_num_faces,
+        refine_landmarks=refine_landmarks,
+        min_detection_confidence=0.5
+    )
+
+
+def create_face_detector():
+    """FaceMesh 전에 실행하는 가벼운 얼굴 검출기 (BlazeFace 근거리 모델, 인물 사진 기준 3~4ms)"""
+    import mediapipe as mp
+    return mp.solutions.face_detection.FaceDetection(model_selection=0, min_detection_confidence=0.5)
+
+
+class FaceMeshPool:
+    def __init__(self, size, factory=create_face_mesh, warm_up=True):
+        self.size = max(1, size)
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._in_use = 0
+        self._checkouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._busy_total = 0.0
+        self._created_at = time.perf_counter()
+
+        for _ in range(self.size):
+            face_mesh = factory()
+            if warm_up:
+                # 첫 추론 시 발생하는 지연(모델 로딩 등)을 미리 처리
+                face_mesh.process(np.zeros((64, 64, 3), dtype=np.uint8))
+            self._idle.put(face_mesh)
+
+    @contextmanager
+    def checkout(self, timeout=None):
+        """FaceMesh 하나를 빌려서 사용 후 자동 반납"""
+        started = time.perf_counter()
+        try:
+            face_mesh = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError("no idle FaceMesh graph available")
+        acquired = time.perf_counter()
+        waited = acquired - started
+
+        with self._lock:
+            self._in_use += 1
+            self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        try:
+            yield face_mesh
+        finally:
+            busy = time.perf_counter() - acquired
+            with self._lock:
+                self._in_use -= 1
+                self._busy_total += busy
+            self._idle.put(face_mesh)
+
+    def stats(self):
+        """대기 시간 및 사용률 지표"""
+        with self._lock:
+            elapsed = time.perf_counter() - self._created_at
+            return {
+                "size": self.size,
+                "in_use": self._in_use,
+                "checkouts": self._checkouts,
+                "wait_avg_ms": round(self._wait_total / self._checkouts * 1000, 3) if self._checkouts else 0.0,
+                "wait_max_ms": round(self._wait_max * 1000, 3),
+                # 풀 생성 이후 전체 그래프 시간 중 실제로 사용된 비율
+                "utilization": round(self._busy_total / (elapsed * self.size), 4) if elapsed > 0 else 0.0
+            }
+
+
+# 그래프 종류별 풀 (1명용 FaceMesh와 여러 얼굴용 FaceMesh 모두 워밍업 때 생성)
+_pools = {}
+_pool_lock = threading.Lock()
+_pool_size = 1
+_options = {"refine_landmarks": True, "detector": False, "max_faces": 1}
+
+
+def configure(size=None, refine_landmarks=None, detector=None, max_faces=None):
+    """풀 생성 옵션 지정 (그래프는 만들지 않음)
+
+    size: init_pool에서 크기를 지정하지 않았을 때 사용할 그래프 수
+    refine_landmarks: FaceMesh 눈동자 세부 랜드마크 계산 여부
+    detector: 워밍업 때 얼굴 검출기 풀도 만들지 여부
+    max_faces: 2 이상이면 워밍업 때 여러 얼굴용(max_num_faces=max_faces) 풀도 생성
+    """
+    global _pool_size
+    if size is not None:
+        _pool_size = max(1, size)
+    if refine_landmarks is not None:
+        _options["refine_landmarks"] = refine_landmarks
+    if detector is not None:
+        _options["detector"] = detector
+    if max_faces is not None:
+        _options["max_faces"] = max(1, max_faces)
+
+
+def _get_pool(key, factory, size=None):
+    """프로세스 전역 풀 생성 (이미 있으면 그대로 사용)
+
+    생성 중에 다른 스레드가 호출하면 생성이 끝날 때까지 기다림
+    """
+    pool = _pools.get(key)
+    if pool is not None:
+        return pool
+    with _pool_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = FaceMeshPool(size or _pool_size, factory=factory)
+            _pools[key] = pool
+    return pool
+
+
+def init_pool(size=None, max_num_faces=1):
+    refine_landmarks = _options["refine_landmarks"]
+    return _get_pool(
+        ("face_mesh", max_num_faces), lambda: create_face_mesh(max_num_faces, refine_landmarks), size
+    )
+
+
+def init_detector_pool(size=None):
+    return _get_pool("face_detection", create_face_detector, size)
+
+
+def warm_up():
+    """워밍업 때 미리 만들 그래프 생성 (1명용 FaceMesh, 설정에 따라 여러 얼굴용 FaceMesh와 얼굴 검출기)
+
+    여러 얼굴용 풀도 1명용과 같은 크기로 미리 만듦 (첫 단체 사진 요청이 전역 잠금 안에서
+    워커 수만큼의 그래프 생성을 기다리다 FACE_TIMEOUT에 걸리지 않도록)
+    """
+    init_pool()
+    if _options["max_faces"] > 1:
+        init_pool(max_num_faces=_options["max_faces"])
+    if _options["detector"]:
+        init_detector_pool()
+
+
+def checkout_face_mesh(timeout=None, max_num_faces=1):
+    return init_pool(max_num_faces=max_num_faces).checkout(timeout=timeout)
+
+
+def checkout_face_detector(timeout=None):
+    return init_detector_pool().checkout(timeout=timeout)
+
+
+def pool_stats(max_num_faces=1):
+    pool = _pools.get(("face_mesh", max_num_faces))
+    return pool.stats() if pool is not None else None
@@ -0,0 +1,195 @@
+# feature_thresholds.py
+# 측정값 → 특징 단계 구간표 (np.searchsorted로 여러 얼굴을 한 번에 분류, 설정 파일이 바뀌면 재시작 없이 다시 읽음)
+import copy
+import json
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 구간표에서 사용할 수 있는 측정값 (landmark_geometry.feature_measures가 계산)
+MEASURES = ("face_width", "eye_area", "eye_ratio", "nose_area", "mouth_width", "face_length")
+
+# 경계값 비교 방향: ">"면 경계값과 같을 때 아래 단계, ">="면 위 단계
+COMPARISONS = (">", ">=")
+
+# 특징별 구간표: compare[i] 조건으로 thresholds[i]를 넘을 때마다 한 단계 위
+# override: 측정값이 compare 조건으로 threshold를 넘으면 구간과 상관없이 label로 분류
+DEFAULT_THRESHOLDS = {
+    "face_width": {
+        "measure": "face_width",
+        "thresholds": [0.16, 0.19, 0.22, 0.25],
+        "compare": [">", ">", ">", ">"],
+        "labels": ["very_narrow", "narrow", "medium", "wide", "very_wide"],
+    },
+    "eye_shape": {
+        # 비율 < 2.5면 round, > 3.5면 narrow (2.5와 3.5는 oval)
+        "measure": "eye_ratio",
+        "thresholds": [2.5, 3.5],
+        "compare": [">=", ">"],
+        "labels": ["round", "oval", "narrow"],
+        "override": {"measure": "eye_area", "threshold": 0.003, "compare": ">", "label": "large"},
+    },
+    "nose_size": {
+        "measure": "nose_area",
+        "thresholds": [0.001, 0.002, 0.004, 0.006],
+        "compare": [">", ">", ">", ">"],
+        "labels": ["very_small", "small", "medium", "large", "very_large"],
+    },
+    "mouth_width": {
+        "measure": "mouth_width",
+        "thresholds": [0.035, 0.05, 0.065, 0.08],
+        "compare": [">", ">", ">", ">"],
+        "labels": ["very_small", "small", "medium", "wide", "very_wide"],
+    },
+    "face_length": {
+        "measure": "face_length",
+        "thresholds": [0.2, 0.25, 0.3, 0.35],
+        "compare": [">", ">", ">", ">"],
+        "labels": ["very_short", "short", "medium", "long", "very_long"],
+    },
+}
+
+
+def merge_thresholds(overrides):
+    """설정 파일 내용을 기본 구간표에 덮어씀 (경계값만 바꿀 수 있음, 단계 이름/개수/비교 방향은 고정)
+
+    overrides 예: {"face_width": {"thresholds": [0.15, 0.18, 0.21, 0.24]}, "eye_shape": {"override": {"threshold": 0.0035}}}
+    """
+    spec = copy.deepcopy(DEFAULT_THRESHOLDS)
+    for feature, row in overrides.items():
+        if feature not in spec:
+            raise ValueError(f"unknown feature: {feature}")
+        if "thresholds" in row:
+            spec[feature]["thresholds"] = [float(t) for t in row["thresholds"]]
+        if "override" in row:
+            if "override" not in spec[feature]:
+                raise ValueError(f"{feature}: no override rule to configure")
+            spec[feature]["override"]["threshold"] = float(row["override"]["threshold"])
+    return spec
+
+
+def validate_thresholds(spec):
+    """구간표 검사 (문제가 있으면 ValueError)"""
+    for feature, row in spec.items():
+        thresholds = row["thresholds"]
+        if row["measure"] not in MEASURES:
+            raise ValueError(f"{feature}: unknown measure {row['measure']}")
+        if len(row["labels"]) != len(thresholds) + 1:
+            raise ValueError(f"{feature}: expected {len(row['labels']) - 1} thresholds, got {len(thresholds)}")
+        if len(thresholds) < 2 or any(a >= b for a, b in zip(thresholds, thresholds[1:])):
+            raise ValueError(f"{feature}: thresholds must be strictly increasing")
+        if not all(np.isfinite(thresholds)):
+            raise ValueError(f"{feature}: thresholds must be finite")
+        if len(row["compare"]) != len(thresholds) or any(c not in COMPARISONS for c in row["compare"]):
+            raise ValueError(f"{feature}: compare must list one of {COMPARISONS} per threshold")
+        override = row.get("override")
+        if override is not None and override["compare"] not in COMPARISONS:
+            raise ValueError(f"{feature}: override compare must be one of {COMPARISONS}")
+
+
+_COMPARE = {">": np.greater, ">=": np.greater_equal}
+
+
+class ThresholdTable:
+    def __init__(self, spec):
+        validate_thresholds(spec)
+        self.spec = spec
+        self.features = list(spec)
+        self.edges = {feature: np.asarray(row["thresholds"], dtype=np.float64) for feature, row in spec.items()}
+        # 비교 방향별 경계값 묶음: ">"는 side="left" (같으면 세지 않음), ">="는 side="right" (같으면 셈)
+        self._searches = {}
+        for feature, row in spec.items():
+            compare = np.asarray(row["compare"])
+            self._searches[feature] = [
+                (self.edges[feature][compare == op], side)
+                for op, side in ((">", "left"), (">=", "right"))
+                if (compare == op).any()
+            ]
+        # 단계 이름은 object 배열로 두고 searchsorted 결과로 바로 인덱싱
+        self._labels = {feature: np.array(row["labels"], dtype=object) for feature, row in spec.items()}
+
+    def bucket_indices(self, measures):
+        """{측정값 이름: (N,)} → {특징: (N,) 단계 번호} (override에 걸린 얼굴은 -1)"""
+        columns = {}
+        for feature, row in self.spec.items():
+            # 넘은 경계의 개수 = 단계 번호 (경계값이 정렬되어 있으므로 방향별 개수를 더하면 됨)
+            values = measures[row["measure"]]
+            searches = self._searches[feature]
+            index = np.searchsorted(searches[0][0], values, side=searches[0][1])
+            for edges, side in searches[1:]:
+                index = index + np.searchsorted(edges, values, side=side)
+            override = row.get("override")
+            if override is not None:
+                above = _COMPARE[override["compare"]](measures[override["measure"]], override["threshold"])
+                index = np.where(above, -1, index)
+            columns[feature] = index
+        return columns
+
+    def bucket(self, measures):
+        """{측정값 이름: (N,)} → {특징: (N,) 단계 이름}"""
+        columns = {}
+        for feature, index in self.bucket_indices(measures).items():
+            labels = self._labels[feature][np.maximum(index, 0)]
+            override = self.spec[feature].get("override")
+            if override is not None:
+                labels[index < 0] = override["label"]
+            columns[feature] = labels
+        return columns
+
+
+_lock = threading.Lock()
+_table = ThresholdTable(DEFAULT_THRESHOLDS)
+_source = {"path": "", "mtime": None, "interval": 5.0, "checked": 0.0}
+
+
+def load(path):
+    """JSON 설정 파일 → ThresholdTable (파일이 없으면 기본 구간표)"""
+    if not path or not os.path.exists(path):
+        return ThresholdTable(DEFAULT_THRESHOLDS)
+    with open(path, encoding="utf-8") as f:
+        return ThresholdTable(merge_thresholds(json.load(f)))
+
+
+def configure(path, reload_seconds=5.0):
+    """구간표 설정 파일 지정 후 바로 읽음 (reload_seconds마다 수정 시각을 확인, 0이면 다시 읽지 않음)"""
+    global _table
+    _source.update(path=path or "", interval=reload_seconds, checked=time.monotonic(), mtime=_mtime(path))
+    with _lock:
+        _table = load(path)
+    return _table
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns if path else None
+    except OSError:
+        return None
+
+
+def current():
+    """현재 구간표 (설정 파일이 바뀌었으면 다시 읽음, 잘못된 파일이면 기존 구간표 유지)"""
+    global _table
+    interval = _source["interval"]
+    if not _source["path"] or interval <= 0:
+        return _table
+    now = time.monotonic()
+    if now - _source["checked"] < interval:
+        return _table
+    with _lock:
+        if now - _source["checked"] < interval:
+            return _table
+        _source["checked"] = now
+        mtime = _mtime(_source["path"])
+        if mtime != _source["mtime"]:
+            _source["mtime"] = mtime
+            try:
+                _table = load(_source["path"])
+                logger.info("Reloaded feature thresholds from %s", _source["path"])
+            except Exception:
+                logger.exception("Invalid feature thresholds in %s, keeping previous table", _source["path"])
+    return _table
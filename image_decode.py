@@ -0,0 +1,77 @@
+# image_decode.py
+# 얼굴 검출 전에 큰 이미지를 줄여서 디코딩하는 빠른 경로
+# (cv2는 import 시간이 길어서 실제로 디코딩할 때 불러옴)
+import numpy as np
+
+# JPEG 프레임 헤더(SOF) 마커 - 이미지 크기 정보가 들어 있음
+_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+# 디코더가 직접 1/8, 1/4, 1/2 크기로 디코딩하는 옵션 (JPEG에서 DCT 단계 작업을 생략)
+_REDUCED_FLAGS = (
+    (8, "IMREAD_REDUCED_COLOR_8"),
+    (4, "IMREAD_REDUCED_COLOR_4"),
+    (2, "IMREAD_REDUCED_COLOR_2"),
+)
+
+
+def jpeg_size(data):
+    """JPEG 헤더만 읽어 (너비, 높이) 반환, JPEG가 아니면 None"""
+    if len(data) < 4 or data[0] != 0xFF or data[1] != 0xD8:
+        return None
+
+    i = 2
+    n = len(data)
+    while i + 9 < n:
+        if data[i] != 0xFF:
+            i += 1
+            continue
+        marker = data[i + 1]
+        if marker == 0xFF:
+            i += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            # 길이 필드가 없는 마커
+            i += 2
+            continue
+        if marker in _SOF_MARKERS:
+            height = int.from_bytes(data[i + 5:i + 7], "big")
+            width = int.from_bytes(data[i + 7:i + 9], "big")
+            return width, height
+        length = int.from_bytes(data[i + 2:i + 4], "big")
+        i += 2 + length
+    return None
+
+
+def downscale(image, max_side):
+    """긴 변이 max_side를 넘으면 비율을 유지하며 축소"""
+    import cv2
+    height, width = image.shape[:2]
+    longest = max(height, width)
+    if max_side <= 0 or longest <= max_side:
+        return image
+    scale = max_side / longest
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    return cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+
+
+def decode_image(contents, max_side=0):
+    """업로드 바이트를 BGR 이미지로 디코딩 (max_side > 0이면 축소), 실패 시 None
+
+    얼굴 특징은 정규화 좌표만 사용하므로 축소해도 결과가 거의 같음
+    """
+    import cv2
+
+    flag = cv2.IMREAD_COLOR
+    if max_side > 0:
+        size = jpeg_size(contents)
+        if size is not None:
+            longest = max(size)
+            for factor, reduced_flag in _REDUCED_FLAGS:
+                if longest // factor >= max_side:
+                    flag = getattr(cv2, reduced_flag)
+                    break
+
+    image = cv2.imdecode(np.frombuffer(contents, np.uint8), flag)
+    if image is None:
+        return None
+    return downscale(image, max_side)
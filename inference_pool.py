@@ -0,0 +1,132 @@
+# inference_pool.py
+# 이벤트 루프를 막지 않도록 FaceMesh 추론을 워커 풀에서 실행
+import asyncio
+import math
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import face_mesh_pool
+
+
+class ImageDecodeError(Exception):
+    """업로드된 바이트를 이미지로 디코딩할 수 없음"""
+
+
+class FaceNotFoundError(Exception):
+    """이미지에서 얼굴을 찾지 못함"""
+
+
+class PoolFullError(Exception):
+    """대기열이 가득 차서 요청을 받을 수 없음"""
+
+    def __init__(self, retry_after):
+        super().__init__("inference queue is full")
+        self.retry_after = retry_after
+
+
+def _warm_up_worker():
+    # 무거운 모듈 import와 그래프 생성(더미 추론 포함)을 미리 수행
+    import cv2
+    face_mesh_pool.warm_up()
+
+
+def _init_process_worker(graph_options):
+    # 프로세스 워커는 각자 그래프 1개짜리 풀을 사용
+    # 작업을 받기 전에 워밍업까지 끝내므로 어떤 프로세스가 첫 요청을 받아도 그래프가 준비되어 있음
+    face_mesh_pool.configure(1, **graph_options)
+    _warm_up_worker()
+
+
+def _worker_ready():
+    return True
+
+
+class InferencePool:
+    def __init__(self, workers, queue_size, timeout, mode="thread", graph_options=None):
+        self.workers = max(1, workers)
+        self.capacity = self.workers + max(0, queue_size)
+        self.timeout = timeout
+        self.mode = mode
+
+        # 그래프 생성 옵션 (face_mesh_pool.configure 인자: refine_landmarks, detector, max_faces)
+        graph_options = graph_options or {}
+        if mode == "process":
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_process_worker, initargs=(graph_options,)
+            )
+        else:
+            # 스레드 워커는 워커 수만큼의 그래프를 공유 풀에서 빌려 씀 (생성은 warm_up에서)
+            face_mesh_pool.configure(self.workers, **graph_options)
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="face-mesh")
+
+        self._lock = threading.Lock()
+        self._pending = 0
+        # 작업 1건당 평균 소요 시간 (지수 이동 평균, Retry-After 계산용)
+        self._avg_seconds = 0.5
+
+    @property
+    def pending(self):
+        """실행 중이거나 대기 중인 작업 수"""
+        return self._pending
+
+    def retry_after(self):
+        """대기열이 비워질 때까지 예상되는 시간 (초, 최소 1)"""
+        return max(1, math.ceil(self._avg_seconds * self._pending / self.workers))
+
+    def _on_done(self, started):
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._pending -= 1
+            self._avg_seconds = 0.8 * self._avg_seconds + 0.2 * elapsed
+
+    async def run(self, fn, *args):
+        """fn(*args)를 워커에서 실행하고 결과를 기다림
+
+        대기열이 가득 차면 PoolFullError, 제한 시간 초과 시 asyncio.TimeoutError 발생
+        """
+        with self._lock:
+            if self._pending >= self.capacity:
+                raise PoolFullError(self.retry_after())
+            self._pending += 1
+
+        if self.mode == "process":
+            # memoryview는 프로세스 간에 전달(pickle)할 수 없으므로 bytes로 변환
+            args = tuple(bytes(arg) if isinstance(arg, memoryview) else arg for arg in args)
+
+        started = time.perf_counter()
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+        # 타임아웃 후에도 실제 작업이 끝날 때까지는 대기열 자리를 차지함
+        future.add_done_callback(lambda _: self._on_done(started))
+        return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+
+    def warm_up(self):
+        """모든 워커의 그래프를 미리 만들고 더미 추론까지 실행 (완료될 때까지 블로킹)"""
+        if self.mode == "process":
+            # 워밍업은 각 프로세스의 initializer에서 실행됨
+            # 워커 수만큼 빈 작업을 한꺼번에 제출해 모든 프로세스를 띄우고 initializer가 끝날 때까지 기다림
+            futures = [self._executor.submit(_worker_ready) for _ in range(self.workers)]
+            for future in futures:
+                future.result()
+        else:
+            _warm_up_worker()
+
+    def stats(self):
+        """풀 상태 지표"""
+        return {
+            "mode": self.mode,
+            "workers": self.workers,
+            "capacity": self.capacity,
+            "pending": self._pending,
+            "avg_job_ms": round(self._avg_seconds * 1000, 3),
+            # 프로세스 모드에서는 그래프 풀이 각 워커 프로세스 안에 있음
+            "face_mesh_pool": face_mesh_pool.pool_stats()
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
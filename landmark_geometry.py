@@ -0,0 +1,209 @@
+# landmark_geometry.py
+# 랜드마크 배열에서 얼굴 측정값을 벡터 연산으로 계산 (여러 얼굴 동시 처리 가능)
+import numpy as np
+
+import feature_thresholds
+
+# 측정에 사용하는 랜드마크 쌍 (시작점, 끝점)
+MEASUREMENT_PAIRS = {
+    "face_width": (234, 454),    # 좌우 볼
+    "eye_width": (33, 133),      # 왼쪽 눈 좌우 끝
+    "eye_height": (159, 145),    # 왼쪽 눈 위아래
+    "nose_width": (220, 440),    # 코 좌우
+    "nose_height": (6, 2),       # 코 위아래
+    "mouth_width": (61, 291),    # 입꼬리
+    "face_length": (10, 175),    # 이마 중앙 ~ 턱 끝
+}
+
+_NAMES = list(MEASUREMENT_PAIRS)
+_START = np.array([MEASUREMENT_PAIRS[name][0] for name in _NAMES], dtype=np.intp)
+_END = np.array([MEASUREMENT_PAIRS[name][1] for name in _NAMES], dtype=np.intp)
+_COLUMN = {name: i for i, name in enumerate(_NAMES)}
+
+# 머리 좌표계 기준점: 양쪽 눈 바깥 끝(가로축, 크기 기준), 이마 중앙/턱 끝(세로축)
+POSE_POINTS = {"left_eye": 33, "right_eye": 263, "top": 10, "bottom": 152}
+
+# 정규화 모드에서 눈 사이 거리를 이 값으로 맞춤 (측정값을 절대 좌표 척도로 되돌려 같은 구간표를 그대로 사용)
+# 기준 인물 사진(benchmarks/samples/grace_hopper.jpg)의 눈 사이 거리: 이 거리로 찍힌 정면 얼굴은 두 모드의 측정값이 같음
+# (길이는 이 값에 비례, 면적은 제곱에 비례하므로 값을 바꾸면 눈 면적 override 등 모든 구간이 함께 어긋남)
+REFERENCE_EYE_DISTANCE = 0.23
+
+# 사용하는 랜드마크 인덱스 중 가장 큰 값 + 1
+MIN_LANDMARKS = int(max(_START.max(), _END.max(), max(POSE_POINTS.values()))) + 1
+
+# 특징별로 필요한 측정 쌍 (랜드마크가 일부만 있을 때 계산할 수 있는 특징 판단용)
+FEATURE_PAIRS = {
+    "face_width": ("face_width",),
+    "eye_shape": ("eye_width", "eye_height"),
+    "nose_size": ("nose_width", "nose_height"),
+    "mouth_width": ("mouth_width",),
+    "face_length": ("face_length",),
+}
+
+# 정규화 측정에 필요한 점만 모은 인덱스: [측정 시작점들, 측정 끝점들, 기준점 4개]
+_GATHER = np.concatenate([_START, _END, [POSE_POINTS[name] for name in ("left_eye", "right_eye", "top", "bottom")]])
+_PAIR_COUNT = len(_NAMES)
+
+
+def landmarks_to_array(landmarks):
+    """랜드마크 → (L, 3) float32 연속 배열
+
+    numpy 배열은 복사 없이 그대로 사용, MediaPipe 원본/dict 목록은 한 번에 변환
+    """
+    if isinstance(landmarks, np.ndarray):
+        return np.ascontiguousarray(landmarks, dtype=np.float32)
+
+    count = len(landmarks)
+    if count and isinstance(landmarks[0], dict):
+        # FastAPI에서 오는 형태: [{"x": 0.5, "y": 0.3, "z": -0.1}, ...]
+        values = (v for lm in landmarks for v in (lm["x"], lm["y"], lm.get("z", 0.0)))
+    else:
+        # MediaPipe 원본 형태
+        values = (v for lm in landmarks for v in (lm.x, lm.y, lm.z))
+    return np.fromiter(values, dtype=np.float32, count=count * 3).reshape(count, 3)
+
+
+def computable_features(count, normalize=False):
+    """랜드마크가 앞에서부터 count개만 있을 때 계산할 수 있는 특징 목록 (정규화 모드는 머리 기준점도 필요)"""
+    if normalize and max(POSE_POINTS.values()) >= count:
+        return []
+    return [
+        feature for feature, names in FEATURE_PAIRS.items()
+        if all(max(MEASUREMENT_PAIRS[name]) < count for name in names)
+    ]
+
+
+def measure_faces(points, normalize=False, aspect=1.0):
+    """(N, L, 2 또는 3) 랜드마크 → (N, 7) 거리 측정값 (MEASUREMENT_PAIRS 순서)
+
+    normalize=True면 머리 기울기/회전을 보정하고 눈 사이 거리로 크기를 정규화 (aspect: 이미지 가로/세로)
+    """
+    points = np.asarray(points)
+    if normalize:
+        return _measure_normalized(points, aspect)
+    # 기존 math.sqrt 계산과 같은 결과가 나오도록 필요한 점만 float64로 계산
+    start = points[:, _START, :2].astype(np.float64)
+    end = points[:, _END, :2].astype(np.float64)
+    dx = start[..., 0] - end[..., 0]
+    dy = start[..., 1] - end[..., 1]
+    return np.sqrt(dx * dx + dy * dy)
+
+
+def _measure_normalized(points, aspect):
+    """3D 랜드마크를 정면 머리 좌표계로 돌린 뒤 측정 → 촬영 거리/yaw/roll/pitch와 무관한 값"""
+    gathered = points[:, _GATHER, :].astype(np.float64)
+    if gathered.shape[2] == 2:
+        gathered = np.concatenate([gathered, np.zeros(gathered.shape[:2] + (1,))], axis=2)
+    # 정규화 좌표는 x는 가로, y는 세로 길이 기준 (z는 x와 같은 척도) → 세로 길이 기준 등방 좌표로 변환
+    scale = np.asarray(aspect, dtype=np.float64).reshape(-1, 1)
+    gathered[:, :, 0] *= scale
+    gathered[:, :, 2] *= scale
+
+    left_eye, right_eye, top, bottom = (gathered[:, 2 * _PAIR_COUNT + i] for i in range(4))
+    x_axis = right_eye - left_eye
+    eye_distance = np.linalg.norm(x_axis, axis=1)
+    safe_distance = np.where(eye_distance > 0, eye_distance, 1.0)
+    x_axis /= safe_distance[:, None]
+    up = top - bottom
+    y_axis = up - np.sum(up * x_axis, axis=1, keepdims=True) * x_axis
+    y_axis /= np.maximum(np.linalg.norm(y_axis, axis=1, keepdims=True), 1e-12)
+    z_axis = np.cross(x_axis, y_axis)
+    rotation = np.stack([x_axis, y_axis, z_axis], axis=2)  # (N, 3, 3), 열이 머리 좌표축
+
+    # 머리 좌표계의 정면(x-y) 평면에 투영한 거리
+    local = np.einsum("nkc,ncd->nkd", gathered[:, :2 * _PAIR_COUNT] - left_eye[:, None, :], rotation)
+    delta = local[:, :_PAIR_COUNT, :2] - local[:, _PAIR_COUNT:, :2]
+    distances = np.sqrt(np.sum(delta * delta, axis=2))
+    factor = np.where(eye_distance > 0, REFERENCE_EYE_DISTANCE / safe_distance, 0.0)
+    return distances * factor[:, None]
+
+
+def bounding_boxes(points):
+    """(N, L, 2 또는 3) 랜드마크 → (N, 4) 정규화 좌표 얼굴 영역 [x_min, y_min, x_max, y_max] (0~1로 자름)"""
+    xy = np.asarray(points)[:, :, :2]
+    return np.clip(np.concatenate([xy.min(axis=1), xy.max(axis=1)], axis=1), 0.0, 1.0)
+
+
+def measurement(distances, name):
+    """measure_faces 결과에서 이름으로 열 선택"""
+    return distances[:, _COLUMN[name]]
+
+
+def feature_measures(distances):
+    """(N, 7) 측정값 → 구간표에서 쓰는 측정값 dict (feature_thresholds.MEASURES)"""
+    eye_width = measurement(distances, "eye_width")
+    eye_height = measurement(distances, "eye_height")
+    safe_height = np.where(eye_height > 0, eye_height, 1.0)
+    return {
+        "face_width": measurement(distances, "face_width"),
+        "eye_area": eye_width * eye_height,
+        "eye_ratio": np.where(eye_height > 0, eye_width / safe_height, 3.0),
+        "nose_area": measurement(distances, "nose_width") * measurement(distances, "nose_height"),
+        "mouth_width": measurement(distances, "mouth_width"),
+        "face_length": measurement(distances, "face_length"),
+    }
+
+
+def bucket_features(distances, table=None):
+    """(N, 7) 측정값 → 얼굴 특징 dict 목록 (table을 주지 않으면 현재 설정의 구간표 사용)"""
+    table = table or feature_thresholds.current()
+    columns = table.bucket(feature_measures(distances))
+    return [
+        {feature: values[i] for feature, values in columns.items()}
+        for i in range(len(distances))
+    ]
+
+
+# 연속 특징 벡터의 열 순서 (breed_matrix.FEATURE_ORDER와 같음)
+VECTOR_FEATURES = ["face_width", "eye_shape", "nose_size", "mouth_width", "face_length"]
+
+
+def _continuous_score(values, thresholds):
+    """측정값 → 1~5 연속 점수, 구간 경계가 x.5가 되도록 선형 보간 (반올림하면 버킷 점수와 같음)"""
+    count = len(thresholds)
+    return np.interp(
+        values,
+        [thresholds[0] - (thresholds[1] - thresholds[0]), *thresholds, thresholds[-1] + (thresholds[-1] - thresholds[-2])],
+        [1.0, *(i + 1.5 for i in range(count)), count + 1.0]
+    )
+
+
+def feature_vectors(distances, table=None):
+    """(N, 7) 측정값 → (N, 5) 연속 특징 점수 (VECTOR_FEATURES 순서, FEATURE_SCORES와 같은 1~5 척도)
+
+    구간 경계는 bucket_features와 같은 구간표를 사용
+    """
+    table = table or feature_thresholds.current()
+    measures = feature_measures(distances)
+    columns = {
+        feature: _continuous_score(measures[table.spec[feature]["measure"]], table.edges[feature])
+        for feature in VECTOR_FEATURES if feature != "eye_shape"
+    }
+
+    # 눈: 면적이 크면 large(5), 아니면 가로세로 비율이 클수록 round(4) → oval(3) → narrow(2)
+    large_area = table.spec["eye_shape"]["override"]["threshold"]
+    low, high = table.edges["eye_shape"]
+    margin = (high - low) / 2
+    columns["eye_shape"] = np.where(
+        measures["eye_area"] > large_area,
+        np.interp(measures["eye_area"], [large_area, large_area * 1.5], [4.5, 5.0]),
+        np.interp(measures["eye_ratio"], [low - margin, low, high, high + margin], [4.0, 3.5, 2.5, 2.0])
+    )
+    return np.stack([columns[feature] for feature in VECTOR_FEATURES], axis=1)
+
+
+def analyze_landmark_vectors(points, normalize=False, aspect=1.0):
+    """(N, L, 2 또는 3) 랜드마크 배열 → (특징 dict 목록, (N, 5) 연속 특징 점수)"""
+    distances = measure_faces(points, normalize, aspect)
+    table = feature_thresholds.current()
+    return bucket_features(distances, table), feature_vectors(distances, table)
+
+
+def analyze_landmarks_batch(points, normalize=False, aspect=1.0):
+    """(N, L, 2 또는 3) 랜드마크 배열 → N개 얼굴의 특징 dict 목록"""
+    return bucket_features(measure_faces(points, normalize, aspect))
+
+
+def analyze_landmarks(points, normalize=False, aspect=1.0):
+    """(L, 2 또는 3) 랜드마크 배열 → 얼굴 특징 dict"""
+    return analyze_landmarks_batch(np.asarray(points)[None], normalize, aspect)[0]
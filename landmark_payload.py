@@ -0,0 +1,68 @@
+# landmark_payload.py
+# 클라이언트가 직접 계산한 FaceMesh 랜드마크 요청 본문 해석 (JSON 또는 little-endian float32 묶음)
+import json
+
+import numpy as np
+
+from landmark_geometry import landmarks_to_array
+
+# FaceMesh 랜드마크 수: 기본 468점, refine_landmarks(눈동자 포함) 478점
+LANDMARK_COUNTS = (468, 478)
+# 묶음 형식: 점마다 x, y, z float32 (478점 = 5736바이트)
+PACKED_DTYPE = np.dtype("<f4")
+PACKED_POINT_BYTES = 3 * PACKED_DTYPE.itemsize
+
+
+class LandmarkPayloadError(ValueError):
+    """랜드마크 본문 형식이 잘못됨 (메시지는 사용자에게 그대로 전달)"""
+
+
+def _validate(points):
+    if points.ndim != 2 or points.shape[1] != 3 or len(points) not in LANDMARK_COUNTS:
+        raise LandmarkPayloadError(f"랜드마크는 {' 또는 '.join(map(str, LANDMARK_COUNTS))}개의 (x, y, z) 좌표여야 합니다.")
+    if not np.isfinite(points).all():
+        raise LandmarkPayloadError("랜드마크 좌표에 숫자가 아닌 값이 있습니다.")
+    return points
+
+
+def decode_packed(body):
+    """little-endian float32 [x0, y0, z0, x1, ...] → (L, 3) float32 배열"""
+    if len(body) % PACKED_POINT_BYTES or len(body) // PACKED_POINT_BYTES not in LANDMARK_COUNTS:
+        sizes = " 또는 ".join(str(count * PACKED_POINT_BYTES) for count in LANDMARK_COUNTS)
+        raise LandmarkPayloadError(f"float32 랜드마크 본문은 {sizes}바이트여야 합니다.")
+    points = np.frombuffer(body, dtype=PACKED_DTYPE).reshape(-1, 3).astype(np.float32)
+    return _validate(points)
+
+
+def decode_json(body):
+    """JSON 본문 → ((L, 3) float32 배열, 가로/세로 비율 또는 None)
+
+    {"landmarks": [{"x": .., "y": .., "z": ..}, ...] 또는 [[x, y, z], ...], "aspect": 1.33}
+    landmarks 목록만 보내도 됨 (z는 생략 가능)
+    """
+    try:
+        data = json.loads(body)
+    except ValueError:
+        raise LandmarkPayloadError("JSON 형식이 올바르지 않습니다.")
+    aspect = None
+    if isinstance(data, dict):
+        aspect = data.get("aspect")
+        data = data.get("landmarks")
+    if not isinstance(data, list) or not data:
+        raise LandmarkPayloadError("landmarks 목록이 필요합니다.")
+
+    try:
+        if isinstance(data[0], dict):
+            points = landmarks_to_array(data)
+        else:
+            points = np.asarray(data, dtype=np.float32)
+            if points.ndim == 2 and points.shape[1] == 2:
+                points = np.concatenate([points, np.zeros((len(points), 1), dtype=np.float32)], axis=1)
+    except (KeyError, TypeError, ValueError):
+        raise LandmarkPayloadError("랜드마크 좌표는 {x, y, z} 객체 또는 [x, y, z] 목록이어야 합니다.")
+
+    if aspect is not None:
+        if isinstance(aspect, bool) or not isinstance(aspect, (int, float)) or not np.isfinite(aspect) or aspect <= 0:
+            raise LandmarkPayloadError("aspect는 0보다 큰 숫자여야 합니다.")
+        aspect = float(aspect)
+    return _validate(points), aspect
@@ -0,0 +1,227 @@
+# metrics.py
+# 가벼운 Prometheus 텍스트 형식 지표 (외부 라이브러리 없음)
+#
+# 비활성화(METRICS_ENABLED=0) 시 타이머는 아무것도 하지 않는 컨텍스트를 돌려주므로
+# 핫 패스 비용은 속성 조회 한 번 수준임
+import bisect
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+import settings
+
+ENABLED = settings.METRICS_ENABLED
+
+# 초 단위 지연 시간 구간
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_registry = []
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _header(self):
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, help_text, labels=()):
+        super().__init__(name, help_text, labels)
+        self._values = {}
+
+    def inc(self, *labels, amount=1):
+        if not ENABLED:
+            return
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = self._header()
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {value}")
+        return lines
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name, help_text):
+        super().__init__(name, help_text)
+        self._value = 0
+
+    def inc(self, amount=1):
+        if not ENABLED:
+            return
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount=1):
+        self.inc(-amount)
+
+    def render(self):
+        return self._header() + [f"{self.name} {self._value}"]
+
+
+class Callback(_Metric):
+    """조회 시점에 function()으로 값을 읽는 지표 (다른 모듈의 카운터 노출용)"""
+
+    def __init__(self, name, help_text, kind, function):
+        super().__init__(name, help_text)
+        self.kind = kind
+        self.function = function
+
+    def render(self):
+        return self._header() + [f"{self.name} {self.function()}"]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets)
+        self._series = {}  # labels -> [구간별 개수(마지막은 +Inf), 합계, 전체 개수]
+
+    def observe(self, value, *labels):
+        if not ENABLED:
+            return
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def _timer(self, labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def time(self, *labels):
+        """with 블록 실행 시간을 기록 (비활성화 시 아무것도 하지 않음)"""
+        return self._timer(labels) if ENABLED else nullcontext()
+
+    def render(self):
+        lines = self._header()
+        with self._lock:
+            for labels, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    le = ("le", repr(float(bound)))
+                    lines.append(f"{self.name}_bucket{_format_labels(self.label_names, labels, le)} {cumulative}")
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, labels, ('le', '+Inf'))} {count}")
+                lines.append(f"{self.name}_sum{_format_labels(self.label_names, labels)} {total}")
+                lines.append(f"{self.name}_count{_format_labels(self.label_names, labels)} {count}")
+        return lines
+
+
+class StageTimer:
+    """워커에서 단계별 소요 시간을 모아 두었다가 호출한 프로세스에서 기록
+
+    프로세스 워커 모드에서도 지표가 메인 프로세스에 모이도록 결과와 함께 반환함
+    """
+
+    def __init__(self):
+        self.timings = {} if ENABLED else None
+
+    @contextmanager
+    def _measure(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = time.perf_counter() - started
+
+    def stage(self, name):
+        return self._measure(name) if ENABLED else nullcontext()
+
+
+def render():
+    """등록된 모든 지표를 Prometheus 텍스트 형식으로 출력"""
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# =========================
+# 서비스 지표
+# =========================
+STAGE_SECONDS = Histogram(
+    "pet_face_stage_seconds", "Time spent in each analysis stage", labels=("stage",)
+)
+REQUEST_SECONDS = Histogram(
+    "pet_face_request_seconds", "End-to-end analysis request latency", labels=("endpoint",)
+)
+REQUESTS = Counter(
+    "pet_face_requests_total", "Analysis requests by endpoint and status code", labels=("endpoint", "status")
+)
+FAILURES = Counter(
+    "pet_face_failures_total", "Analysis failures by reason", labels=("reason",)
+)
+IN_FLIGHT = Gauge("pet_face_in_flight_requests", "Analysis requests currently in progress")
+
+
+def observe_stages(timings):
+    """StageTimer.timings를 단계별 히스토그램에 기록"""
+    if timings:
+        for name, seconds in timings.items():
+            STAGE_SECONDS.observe(seconds, name)
+
+
+class MetricsMiddleware:
+    """분석 엔드포인트의 지연 시간/상태 코드/동시 처리 수 기록 (ASGI 미들웨어)"""
+
+    def __init__(self, app, paths):
+        self.app = app
+        self.paths = set(paths)
+
+    async def __call__(self, scope, receive, send):
+        if not ENABLED or scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        endpoint = scope["path"]
+        status = 500
+
+        async def recording_send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, recording_send)
+        finally:
+            IN_FLIGHT.dec()
+            REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint)
+            REQUESTS.inc(endpoint, str(status))
@@ -0,0 +1,85 @@
+# precompressed.py
+# 시작 시 한 번 만들어 둔 정적 응답 (gzip/brotli 미리 압축, ETag, 304 지원)
+import gzip
+import hashlib
+
+from fastapi.responses import Response
+
+try:
+    import brotli  # 선택 의존성: 설치되어 있으면 br 인코딩도 제공
+except ImportError:
+    brotli = None
+
+# 같은 q 값이면 앞쪽 인코딩을 우선 사용
+_PREFERRED_ENCODINGS = ("br", "gzip", "identity")
+
+
+def parse_accept_encoding(header):
+    """Accept-Encoding 헤더 → {인코딩: q 값}"""
+    accepted = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[name] = q
+    return accepted
+
+
+class PrecompressedAsset:
+    def __init__(self, body, media_type, cache_control="public, max-age=300"):
+        self.media_type = media_type
+        self.cache_control = cache_control
+        digest = hashlib.sha256(body).hexdigest()[:32]
+
+        # 인코딩별 (본문, 강한 ETag) - 표현이 다르면 강한 ETag도 달라야 함
+        self.variants = {"identity": (body, f'"{digest}"')}
+        self.variants["gzip"] = (gzip.compress(body, compresslevel=9, mtime=0), f'"{digest}-gzip"')
+        if brotli is not None:
+            self.variants["br"] = (brotli.compress(body, quality=11), f'"{digest}-br"')
+
+    def choose_encoding(self, accept_encoding):
+        if not accept_encoding:
+            return "identity"
+        accepted = parse_accept_encoding(accept_encoding)
+        wildcard = accepted.get("*")
+        best, best_q = "identity", 0.0
+        for encoding in _PREFERRED_ENCODINGS:
+            if encoding not in self.variants:
+                continue
+            q = accepted.get(encoding, wildcard if wildcard is not None else (1.0 if encoding == "identity" else 0.0))
+            if q > best_q:
+                best, best_q = encoding, q
+        return best
+
+    def _not_modified(self, if_none_match):
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        # If-None-Match는 약한 비교 (W/ 접두어 무시), 어떤 인코딩의 ETag든 같은 내용이면 일치
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return any(etag in tags for _, etag in self.variants.values())
+
+    def response(self, headers):
+        """요청 헤더에 맞는 Response (304 / 압축 본문) 반환"""
+        encoding = self.choose_encoding(headers.get("accept-encoding"))
+        body, etag = self.variants[encoding]
+        response_headers = {
+            "ETag": etag,
+            "Cache-Control": self.cache_control,
+            "Vary": "Accept-Encoding",
+        }
+        if self._not_modified(headers.get("if-none-match")):
+            return Response(status_code=304, headers=response_headers)
+        if encoding != "identity":
+            response_headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type=self.media_type, headers=response_headers)
@@ -0,0 +1,236 @@
+# result_cache.py
+# 업로드 이미지 내용 해시 → 얼굴 랜드마크 캐시
+#
+# 얼굴 특징은 랜드마크로부터 빠르게 다시 계산할 수 있으므로 랜드마크 배열과 이미지 가로/세로 비율만 저장함
+#   - MemoryCache: 프로세스 내부 LRU + TTL
+#   - SQLiteCache: 로컬 디스크 SQLite 파일을 여러 uvicorn 워커 프로세스가 공유
+import hashlib
+import os
+import sqlite3
+import struct
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+# 랜드마크 배열 외의 대략적인 항목당 메모리 사용량
+ENTRY_OVERHEAD_BYTES = 128
+
+
+def content_key(contents):
+    """업로드 바이트의 빠른 해시 (128비트 BLAKE2b)"""
+    return hashlib.blake2b(contents, digest_size=16).digest()
+
+
+def pack_landmarks(landmarks, aspect=1.0):
+    """랜드마크 배열 → 가로/세로 비율 + 차원 정보 + little-endian float32 바이트 (JSON 대비 훨씬 작음)
+
+    가로/세로 비율은 float64 그대로 저장 (캐시 적중 시에도 캐시하지 않은 계산과 같은 구간으로 분류되도록)
+    """
+    landmarks = np.ascontiguousarray(landmarks, dtype="<f4")
+    header = struct.pack(f"<dB{landmarks.ndim}H", aspect, landmarks.ndim, *landmarks.shape)
+    return header + landmarks.tobytes()
+
+
+def unpack_landmarks(data):
+    """pack_landmarks 결과 → (랜드마크 배열, 가로/세로 비율)"""
+    aspect, ndim = struct.unpack_from("<dB", data)
+    shape = struct.unpack_from(f"<{ndim}H", data, 9)
+    return np.frombuffer(data, dtype="<f4", offset=9 + 2 * ndim).reshape(shape), aspect
+
+
+class CacheBackend:
+    """캐시 백엔드 공통 인터페이스"""
+
+    # True면 get/put이 디스크 I/O나 잠금 대기로 오래 걸릴 수 있음 (비동기 코드에서는 스레드에서 호출)
+    blocking = False
+
+    def __init__(self, max_entries, max_bytes, ttl):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    def get(self, key):
+        """캐시된 (랜드마크 배열, 가로/세로 비율) 반환, 없거나 만료되었으면 None"""
+        raise NotImplementedError
+
+    def put(self, key, landmarks, aspect=1.0):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def _counters(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+class MemoryCache(CacheBackend):
+    """프로세스 내부 캐시 (개수/용량 제한 LRU + TTL)"""
+
+    def __init__(self, max_entries, max_bytes, ttl):
+        super().__init__(max_entries, max_bytes, ttl)
+        self._entries = OrderedDict()  # key -> (만료 시각, 크기, (랜드마크, 가로/세로 비율))
+        self._lock = threading.Lock()
+        self._bytes = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, size, value = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, landmarks, aspect=1.0):
+        size = landmarks.nbytes + ENTRY_OVERHEAD_BYTES
+        if not self.enabled or size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, size, (landmarks, aspect))
+            self._bytes += size
+            # 개수/용량 제한을 넘으면 가장 오래 사용하지 않은 항목부터 제거
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {"backend": "memory", "entries": len(self._entries), "bytes": self._bytes, **self._counters()}
+
+
+class SQLiteCache(CacheBackend):
+    """로컬 SQLite 파일 캐시 (여러 워커 프로세스가 같은 파일을 공유)
+
+    조회는 읽기 전용이라 쓰기 잠금을 잡지 않음: 사용 시각 갱신은 모아 두었다가 다음 put 트랜잭션에서 함께 기록하고,
+    만료된 항목도 put에서 정리함
+    """
+
+    blocking = True
+
+    def __init__(self, path, max_entries, max_bytes, ttl):
+        super().__init__(max_entries, max_bytes, ttl)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        self._touched = {}  # key -> 마지막 조회 시각 (아직 기록하지 않은 것)
+
+    def _connection(self):
+        # 연결은 fork 이후 각 프로세스에서 새로 열어야 함
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            # 값 형식이 바뀔 때마다 새 테이블 사용 (가로/세로 비율 추가 → float64로 변경, 이전 landmarks/faces 테이블은 읽지 않음)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS face_landmarks ("
+                " key BLOB PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL,"
+                " expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS face_landmarks_accessed ON face_landmarks (accessed_at)")
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute("SELECT value, expires_at FROM face_landmarks WHERE key = ?", (key,)).fetchone()
+            if row is None or row[1] < now:
+                self.misses += 1
+                return None
+            self._touched[key] = now
+            self.hits += 1
+        return unpack_landmarks(row[0])
+
+    def put(self, key, landmarks, aspect=1.0):
+        value = pack_landmarks(landmarks, aspect)
+        if not self.enabled or len(value) > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # 조회 때 미뤄 둔 사용 시각 갱신 (LRU 제거 순서용)
+                if self._touched:
+                    conn.executemany(
+                        "UPDATE face_landmarks SET accessed_at = ? WHERE key = ?",
+                        [(accessed_at, touched) for touched, accessed_at in self._touched.items()]
+                    )
+                    self._touched.clear()
+                conn.execute(
+                    "INSERT OR REPLACE INTO face_landmarks (key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, value, len(value), now + self.ttl, now)
+                )
+                conn.execute("DELETE FROM face_landmarks WHERE expires_at < ?", (now,))
+                # 개수/용량 제한을 넘으면 가장 오래 사용하지 않은 항목부터 제거
+                count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM face_landmarks").fetchone()
+                while count > self.max_entries or total > self.max_bytes:
+                    oldest = conn.execute(
+                        "SELECT key, size FROM face_landmarks ORDER BY accessed_at LIMIT 1"
+                    ).fetchone()
+                    conn.execute("DELETE FROM face_landmarks WHERE key = ?", (oldest[0],))
+                    count -= 1
+                    total -= oldest[1]
+                    self.evictions += 1
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def clear(self):
+        with self._lock:
+            self._connection().execute("DELETE FROM face_landmarks")
+            self._touched.clear()
+
+    def stats(self):
+        with self._lock:
+            count, total = self._connection().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM face_landmarks"
+            ).fetchone()
+        # hits/misses/evictions는 현재 프로세스 기준
+        return {"backend": "sqlite", "entries": count, "bytes": total, **self._counters()}
+
+
+def create_cache(backend, max_entries, max_bytes, ttl, path=None):
+    """설정값에 맞는 캐시 백엔드 생성"""
+    if backend == "sqlite":
+        return SQLiteCache(path, max_entries, max_bytes, ttl)
+    if backend == "memory":
+        return MemoryCache(max_entries, max_bytes, ttl)
+    raise ValueError(f"unknown cache backend: {backend}")
@@ -0,0 +1,114 @@
+# settings.py
+# 환경 변수로 조정 가능한 서버 설정값
+import os
+import tempfile
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def _env_float(name, default):
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+# =========================
+# 추론 워커 풀
+# =========================
+# 워커 수 (기본값: CPU 코어 수)
+INFERENCE_WORKERS = _env_int("FACE_WORKERS", os.cpu_count() or 1)
+# "thread" 또는 "process"
+INFERENCE_MODE = os.environ.get("FACE_WORKER_MODE", "thread")
+# 실행 중인 작업 외에 대기열에 쌓을 수 있는 최대 요청 수
+INFERENCE_QUEUE_SIZE = _env_int("FACE_QUEUE_SIZE", 16)
+# 요청당 추론 제한 시간 (초)
+INFERENCE_TIMEOUT = _env_float("FACE_TIMEOUT", 10.0)
+# 배치 분석 API 한 번에 받을 수 있는 최대 이미지 수
+BATCH_MAX_IMAGES = _env_int("BATCH_MAX_IMAGES", 50)
+# 배치 분석 API 요청 본문 최대 크기 (바이트)
+BATCH_MAX_BODY_BYTES = _env_int("BATCH_MAX_BODY_BYTES", 100 * 1024 * 1024)
+# 배치 분석 API에서 zip 안의 이미지를 압축 해제한 전체 크기 상한 (바이트)
+BATCH_MAX_UNCOMPRESSED_BYTES = _env_int("BATCH_MAX_UNCOMPRESSED_BYTES", 100 * 1024 * 1024)
+
+# /analyze-face?max_faces=N 에서 허용하는 최대 얼굴 수 (여러 얼굴용 FaceMesh 그래프의 max_num_faces)
+# 2 이상이면 워밍업 때 워커 수만큼의 여러 얼굴용 그래프를 추가로 만듦 (1이면 단체 사진 분석과 그 그래프를 쓰지 않음)
+MAX_FACES = _env_int("MAX_FACES", 10)
+
+# =========================
+# 얼굴 검출 파이프라인
+# =========================
+# "mesh": 전체 프레임에 FaceMesh 실행 (기본값)
+# "detector": 축소한 프레임에서 얼굴 검출기를 먼저 실행해 얼굴이 없으면 바로 거절, 얼굴 영역만 잘라서 FaceMesh 실행
+#   FaceMesh도 내부에서 같은 검출기를 돌리므로 인물 사진 기준 지연은 약간 늘지만,
+#   얼굴이 작게 찍힌 사진에서 잘라낸 영역으로 랜드마크를 찾는 경우가 있음
+FACE_PIPELINE = os.environ.get("FACE_PIPELINE", "mesh")
+# 0이면 FaceMesh 눈동자 세부 랜드마크(refine_landmarks)를 끔 (478 → 468점, 측정에 쓰는 점은 모두 포함)
+# 인물 사진 기준 FaceMesh 단계가 약 15% 줄지만 랜드마크 위치가 조금 달라져 일부 분류가 바뀔 수 있음
+REFINE_LANDMARKS = os.environ.get("REFINE_LANDMARKS", "1") != "0"
+
+# =========================
+# 이미지 디코딩
+# =========================
+# 얼굴 검출 전 이미지의 긴 변을 이 크기 이하로 축소 (0이면 원본 크기 사용)
+MAX_IMAGE_SIDE = _env_int("MAX_IMAGE_SIDE", 1024)
+
+# =========================
+# 실시간 카메라 (/ws/video)
+# =========================
+# 동시에 열 수 있는 영상 연결 수 (연결마다 추적 모드 FaceMesh 그래프 1개)
+VIDEO_MAX_CONNECTIONS = _env_int("VIDEO_MAX_CONNECTIONS", 4)
+# 프레임의 긴 변을 이 크기 이하로 축소 후 분석
+VIDEO_MAX_SIDE = _env_int("VIDEO_MAX_SIDE", 640)
+# 측정값 이동 평균에 사용할 최근 프레임 수
+VIDEO_SMOOTHING_WINDOW = _env_int("VIDEO_SMOOTHING_WINDOW", 8)
+# 프레임 1장 최대 크기 (바이트, 넘으면 연결 종료)
+VIDEO_MAX_FRAME_BYTES = _env_int("VIDEO_MAX_FRAME_BYTES", 1024 * 1024)
+
+# =========================
+# 분석 결과 캐시
+# =========================
+# 같은 이미지를 다시 올리면 디코딩/FaceMesh 없이 저장된 랜드마크를 재사용
+# "memory": 프로세스별 캐시, "sqlite": 여러 uvicorn 워커가 공유하는 로컬 파일 캐시
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "memory")
+CACHE_PATH = os.environ.get("CACHE_PATH", os.path.join(tempfile.gettempdir(), "pet_face_cache.sqlite3"))
+CACHE_MAX_ENTRIES = _env_int("CACHE_MAX_ENTRIES", 1024)  # 0이면 캐시 사용 안 함
+CACHE_MAX_BYTES = _env_int("CACHE_MAX_BYTES", 32 * 1024 * 1024)
+CACHE_TTL = _env_float("CACHE_TTL", 600.0)  # 초
+
+# =========================
+# 지표 (/metrics)
+# =========================
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") != "0"
+
+# =========================
+# 얼굴 측정 방식
+# =========================
+# "absolute": 이미지 좌표 기준 거리 (기본값, 기존 결과와 동일)
+# "normalized": 눈 사이 거리로 크기를 정규화하고 3D 랜드마크로 머리 회전을 보정 (촬영 거리/각도와 무관)
+MEASUREMENT_MODE = os.environ.get("MEASUREMENT_MODE", "absolute")
+
+# 특징 단계 경계값 설정 파일 (JSON, 비어 있으면 feature_thresholds.DEFAULT_THRESHOLDS 사용)
+# 예: {"face_width": {"thresholds": [0.15, 0.18, 0.21, 0.24]}, "eye_shape": {"override": {"threshold": 0.0035}}}
+FEATURE_THRESHOLDS_PATH = os.environ.get("FEATURE_THRESHOLDS_PATH", "")
+# 설정 파일 수정 여부를 확인하는 간격 (초, 0이면 시작 시 한 번만 읽음)
+FEATURE_THRESHOLDS_RELOAD_SECONDS = _env_float("FEATURE_THRESHOLDS_RELOAD_SECONDS", 5.0)
+
+# =========================
+# 매칭 방식
+# =========================
+# "discrete": 5단계 버킷 점수로 매칭 (기본값, 기존 결과와 동일)
+# "continuous": 측정값을 1~5 연속 점수로 유지해 매칭 (동점이 거의 없고 순위가 더 세밀함)
+MATCH_MODE = os.environ.get("MATCH_MODE", "discrete")
+
+# 1이면 특징 조합(5단계 × 5개 = 3125가지)별 매칭/분석 결과와 응답 JSON 조각을 표로 저장해 재사용
+ANSWER_TABLE = os.environ.get("ANSWER_TABLE", "1") != "0"
+
+# =========================
+# 품종 카탈로그
+# =========================
+# 품종 추가/수정은 코드 대신 이 JSON 파일만 고치면 됨
+BREED_CATALOG_PATH = os.environ.get(
+    "BREED_CATALOG_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "breeds.json")
+)
@@ -0,0 +1,58 @@
+# tests/test_batch_zip.py
+# /analyze-faces/batch: zip 안의 읽을 수 없는 항목은 해당 항목만 실패로 보고하고 나머지는 계속 분석
+#
+# 실행 (저장소 루트에서): python -m pytest tests
+import io
+import struct
+import zipfile
+
+from fastapi.testclient import TestClient
+
+import Main
+
+CENTRAL_HEADER = b"PK\x01\x02"
+
+
+def make_zip(entries, flag_bits=None, compress_type=None):
+    """{파일명: 바이트} → zip 바이트 (flag_bits/compress_type: {파일명: 값}으로 중앙 디렉터리 값을 바꿈)"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in entries.items():
+            archive.writestr(name, data)
+    data = bytearray(buffer.getvalue())
+    # zipfile은 암호화/AES 항목을 만들 수 없으므로 중앙 디렉터리의 플래그와 압축 방식을 직접 수정
+    offset = data.find(CENTRAL_HEADER)
+    for name in entries:
+        if flag_bits and name in flag_bits:
+            struct.pack_into("<H", data, offset + 8, flag_bits[name])
+        if compress_type and name in compress_type:
+            struct.pack_into("<H", data, offset + 10, compress_type[name])
+        name_length, extra_length, comment_length = struct.unpack_from("<HHH", data, offset + 28)
+        offset += 46 + name_length + extra_length + comment_length
+    return bytes(data)
+
+
+def post_batch(zip_bytes):
+    client = TestClient(Main.app)
+    return client.post("/analyze-faces/batch", files=[("files", ("photos.zip", zip_bytes, "application/zip"))])
+
+
+def test_encrypted_entry_fails_alone():
+    zip_bytes = make_zip({"locked.jpg": b"\xff\xd8secret", "broken.jpg": b"not an image"}, flag_bits={"locked.jpg": 0x1})
+    response = post_batch(zip_bytes)
+    assert response.status_code == 200
+    results = {item["filename"]: item for item in response.json()["results"]}
+    assert results["locked.jpg"]["success"] is False
+    assert results["locked.jpg"]["status"] == 400
+    # 나머지 항목은 그대로 분석됨 (디코딩 실패)
+    assert results["broken.jpg"]["status"] == 400
+    assert results["broken.jpg"]["error"] != results["locked.jpg"]["error"]
+
+
+def test_unsupported_compression_fails_alone():
+    zip_bytes = make_zip({"aes.jpg": b"\xff\xd8data", "broken.jpg": b"not an image"}, compress_type={"aes.jpg": 99})
+    response = post_batch(zip_bytes)
+    assert response.status_code == 200
+    results = {item["filename"]: item for item in response.json()["results"]}
+    assert results["aes.jpg"]["status"] == 400
+    assert results["broken.jpg"]["status"] == 400
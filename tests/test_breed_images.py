@@ -0,0 +1,28 @@
+# tests/test_breed_images.py
+# 품종 이미지 파일 검사: 없는 파일은 누락 목록으로 보고되고 /health/ready가 실패
+#
+# 실행 (저장소 루트에서): python -m pytest tests
+import os
+
+from fastapi.testclient import TestClient
+
+import breed_images
+import Main
+
+
+def test_validate_images_reports_missing_files(tmp_path):
+    (tmp_path / "a.png").write_bytes(b"png")
+    breeds = {
+        "a": {"image": "a.png", "image_url": "/static/dogs/a.png"},
+        "b": {"image": "b.png", "image_url": "/static/dogs/b.png"},
+    }
+    missing = breed_images.validate_images([("dog", breeds, lambda url: os.path.join(tmp_path, url.rsplit("/", 1)[1]))])
+    assert [(breed, image) for _, breed, image, _ in missing] == [("b", "/static/dogs/b.png")]
+
+
+def test_readiness_fails_when_breed_images_are_missing(monkeypatch):
+    monkeypatch.setitem(Main.warm_up_state, "ready", True)
+    monkeypatch.setitem(Main.warm_up_state, "missing_images", ["/static/dogs/Shiba_Inu.png"])
+    response = TestClient(Main.app).get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["missing_images"] == ["/static/dogs/Shiba_Inu.png"]
@@ -0,0 +1,38 @@
+# tests/test_face_analyzer.py
+# 랜드마크가 일부만 있을 때 FaceAnalyzer가 계산할 수 있는 특징은 계산하고 나머지만 기본값을 쓰는지 확인
+#
+# 실행 (저장소 루트에서): python -m pytest tests
+import numpy as np
+
+from face_analyzer import FaceAnalyzer
+
+
+def random_landmarks(seed=0):
+    return np.random.default_rng(seed).uniform(0.3, 0.7, size=(478, 3)).astype(np.float32)
+
+
+def test_partial_landmarks_keep_computable_features():
+    analyzer = FaceAnalyzer()
+    for seed in range(20):
+        points = random_landmarks(seed)
+        full = analyzer.analyze_face_features(points)
+        # 300점: 볼(234/454)과 코 너비(220/440)는 없고 눈/입/얼굴 길이에 쓰는 점은 있음
+        partial = analyzer.analyze_face_features(points[:300])
+        assert partial == {
+            "face_width": FaceAnalyzer.DEFAULT_FEATURES["face_width"],
+            "eye_shape": full["eye_shape"],
+            "nose_size": FaceAnalyzer.DEFAULT_FEATURES["nose_size"],
+            "mouth_width": full["mouth_width"],
+            "face_length": full["face_length"],
+        }
+
+
+def test_too_few_landmarks_use_defaults():
+    analyzer = FaceAnalyzer()
+    assert analyzer.analyze_face_features(random_landmarks()[:30]) == FaceAnalyzer.DEFAULT_FEATURES
+    # 정규화 모드는 머리 기준점(263)이 없으면 모든 특징이 기본값
+    assert FaceAnalyzer(normalize=True).analyze_face_features(random_landmarks()[:260]) == FaceAnalyzer.DEFAULT_FEATURES
+
+
+def test_empty_landmarks_return_none():
+    assert FaceAnalyzer().analyze_face_features([]) is None
@@ -0,0 +1,127 @@
+# tests/test_feature_thresholds.py
+# 구간표 분류가 기존 FaceAnalyzer의 if/elif 분류와 경계값까지 같은지 확인
+#
+# 실행 (저장소 루트에서): python -m pytest tests
+import numpy as np
+import pytest
+
+import feature_thresholds
+from feature_thresholds import DEFAULT_THRESHOLDS, ThresholdTable
+
+
+# 기존 FaceAnalyzer._analyze_* 메서드의 분류 조건 그대로
+def baseline_face_width(face_width):
+    if face_width > 0.25:
+        return "very_wide"
+    elif face_width > 0.22:
+        return "wide"
+    elif face_width > 0.19:
+        return "medium"
+    elif face_width > 0.16:
+        return "narrow"
+    return "very_narrow"
+
+
+def baseline_eye_shape(eye_area, ratio):
+    if eye_area > 0.003:
+        return "large"
+    elif ratio > 3.5:
+        return "narrow"
+    elif ratio < 2.5:
+        return "round"
+    return "oval"
+
+
+def baseline_nose_size(nose_area):
+    if nose_area > 0.006:
+        return "very_large"
+    elif nose_area > 0.004:
+        return "large"
+    elif nose_area > 0.002:
+        return "medium"
+    elif nose_area > 0.001:
+        return "small"
+    return "very_small"
+
+
+def baseline_mouth_width(mouth_width):
+    if mouth_width > 0.08:
+        return "very_wide"
+    elif mouth_width > 0.065:
+        return "wide"
+    elif mouth_width > 0.05:
+        return "medium"
+    elif mouth_width > 0.035:
+        return "small"
+    return "very_small"
+
+
+def baseline_face_length(face_length):
+    if face_length > 0.35:
+        return "very_long"
+    elif face_length > 0.3:
+        return "long"
+    elif face_length > 0.25:
+        return "medium"
+    elif face_length > 0.2:
+        return "short"
+    return "very_short"
+
+
+SINGLE_MEASURE_BASELINES = {
+    "face_width": baseline_face_width,
+    "nose_size": baseline_nose_size,
+    "mouth_width": baseline_mouth_width,
+    "face_length": baseline_face_length,
+}
+
+
+def around(thresholds):
+    """경계값 자체와 바로 위/아래 float64 값, 구간 가운데 값"""
+    values = [0.0]
+    for t in thresholds:
+        values += [np.nextafter(t, -np.inf), t, np.nextafter(t, np.inf)]
+    values += [(a + b) / 2 for a, b in zip(thresholds, thresholds[1:])]
+    values.append(thresholds[-1] * 2)
+    return np.array(values, dtype=np.float64)
+
+
+def measures_for(**columns):
+    """구간표 입력 dict (지정하지 않은 측정값은 중간 구간 값)"""
+    size = len(next(iter(columns.values())))
+    measures = {
+        "face_width": np.full(size, 0.2),
+        "eye_area": np.full(size, 0.001),
+        "eye_ratio": np.full(size, 3.0),
+        "nose_area": np.full(size, 0.003),
+        "mouth_width": np.full(size, 0.06),
+        "face_length": np.full(size, 0.28),
+    }
+    measures.update(columns)
+    return measures
+
+
+@pytest.mark.parametrize("feature", sorted(SINGLE_MEASURE_BASELINES))
+def test_single_measure_boundaries_match_baseline(feature):
+    row = DEFAULT_THRESHOLDS[feature]
+    values = around(row["thresholds"])
+    labels = ThresholdTable(DEFAULT_THRESHOLDS).bucket(measures_for(**{row["measure"]: values}))[feature]
+    expected = [SINGLE_MEASURE_BASELINES[feature](value) for value in values]
+    assert list(labels) == expected
+
+
+def test_eye_shape_boundaries_match_baseline():
+    row = DEFAULT_THRESHOLDS["eye_shape"]
+    ratios = around(row["thresholds"])
+    areas = around([row["override"]["threshold"]])
+    eye_area, eye_ratio = (grid.ravel() for grid in np.meshgrid(areas, ratios))
+    labels = ThresholdTable(DEFAULT_THRESHOLDS).bucket(measures_for(eye_area=eye_area, eye_ratio=eye_ratio))["eye_shape"]
+    expected = [baseline_eye_shape(area, ratio) for area, ratio in zip(eye_area, eye_ratio)]
+    assert list(labels) == expected
+
+
+def test_eye_ratio_at_lower_boundary_is_oval():
+    # 기존 분류에서 비율이 정확히 2.5인 눈은 oval (round는 2.5 미만)
+    measures = measures_for(eye_area=np.array([0.001, 0.001]), eye_ratio=np.array([2.5, np.nextafter(2.5, 0)]))
+    for table in (ThresholdTable(DEFAULT_THRESHOLDS), feature_thresholds.current()):
+        assert list(table.bucket(measures)["eye_shape"]) == ["oval", "round"]
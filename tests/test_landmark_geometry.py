@@ -0,0 +1,73 @@
+# tests/test_landmark_geometry.py
+# 정규화 측정값이 절대 좌표 측정값과 같은 척도인지 확인 (같은 구간표로 분류했을 때 단계 분포가 같아야 함)
+#
+# 실행 (저장소 루트에서): python -m pytest tests
+from collections import Counter
+
+import numpy as np
+
+from landmark_geometry import MIN_LANDMARKS, POSE_POINTS, bucket_features, measure_faces
+
+# 기준 인물 사진(benchmarks/samples/grace_hopper.jpg)의 눈 사이 거리 (구간표가 맞춰진 촬영 거리)
+SAMPLE_EYE_DISTANCE = 0.23
+
+
+def make_face(face_width, eye_width, eye_height, nose_width, nose_height, mouth_width, face_length,
+              eye_distance=SAMPLE_EYE_DISTANCE):
+    """측정에 쓰는 점만 채운 정면 얼굴 (L, 3) 랜드마크 (이미지 가운데, z=0)"""
+    points = np.zeros((MIN_LANDMARKS, 3), dtype=np.float32)
+    cx, eye_y, top = 0.5, 0.42, 0.5 - face_length / 2
+    left_eye = cx - eye_distance / 2
+    points[POSE_POINTS["left_eye"]] = (left_eye, eye_y, 0)
+    points[POSE_POINTS["right_eye"]] = (cx + eye_distance / 2, eye_y, 0)
+    points[133] = (left_eye + eye_width, eye_y, 0)
+    points[159] = (left_eye + eye_width / 2, eye_y - eye_height / 2, 0)
+    points[145] = (left_eye + eye_width / 2, eye_y + eye_height / 2, 0)
+    points[234], points[454] = (cx - face_width / 2, 0.5, 0), (cx + face_width / 2, 0.5, 0)
+    points[220], points[440] = (cx - nose_width / 2, 0.52, 0), (cx + nose_width / 2, 0.52, 0)
+    points[6], points[2] = (cx, 0.52 - nose_height / 2, 0), (cx, 0.52 + nose_height / 2, 0)
+    points[61], points[291] = (cx - mouth_width / 2, 0.6, 0), (cx + mouth_width / 2, 0.6, 0)
+    points[10], points[175] = (cx, top, 0), (cx, top + face_length, 0)
+    points[POSE_POINTS["bottom"]] = (cx, top + face_length + 0.01, 0)
+    return points
+
+
+def reference_set(size=300, seed=0):
+    """기준 사진과 같은 촬영 거리의 정면 얼굴들, 측정값은 모든 단계에 걸치도록 고름"""
+    rng = np.random.default_rng(seed)
+    faces = [
+        make_face(
+            face_width=rng.uniform(0.14, 0.28),
+            eye_width=rng.uniform(0.05, 0.09),
+            eye_height=rng.uniform(0.012, 0.04),
+            nose_width=rng.uniform(0.02, 0.09),
+            nose_height=rng.uniform(0.03, 0.09),
+            mouth_width=rng.uniform(0.025, 0.095),
+            face_length=rng.uniform(0.18, 0.38),
+        )
+        for _ in range(size)
+    ]
+    return np.stack(faces)
+
+
+def distribution(features_list):
+    return {feature: Counter(features[feature] for features in features_list) for feature in features_list[0]}
+
+
+def test_normalized_buckets_match_absolute_on_reference_set():
+    faces = reference_set()
+    absolute = bucket_features(measure_faces(faces))
+    normalized = bucket_features(measure_faces(faces, normalize=True))
+    assert distribution(normalized) == distribution(absolute)
+    # 눈 면적 override(large)도 정규화 모드에서 그대로 나옴
+    assert distribution(normalized)["eye_shape"]["large"] > 0
+
+
+def test_normalized_buckets_ignore_camera_distance():
+    faces = reference_set(size=50, seed=1)
+    expected = bucket_features(measure_faces(faces, normalize=True))
+    for scale in (0.5, 1.6):
+        # 가운데를 기준으로 확대/축소 (더 멀리/가까이서 찍은 사진)
+        scaled = faces.copy()
+        scaled[:, :, :2] = 0.5 + (faces[:, :, :2] - 0.5) * scale
+        assert bucket_features(measure_faces(scaled, normalize=True)) == expected
@@ -0,0 +1,25 @@
+# tests/test_result_cache.py
+# 캐시에 저장한 랜드마크/가로세로 비율이 캐시하지 않은 계산과 같은 값으로 돌아오는지 확인
+#
+# 실행 (저장소 루트에서): python -m pytest tests
+import numpy as np
+
+from result_cache import SQLiteCache, pack_landmarks, unpack_landmarks
+
+
+def test_pack_keeps_aspect_exact():
+    landmarks = np.random.default_rng(0).random((478, 3), dtype=np.float32)
+    # float32로 저장하면 값이 바뀌는 비율 (예: 1112x600 이미지)
+    aspect = 1112 / 600
+    restored, restored_aspect = unpack_landmarks(pack_landmarks(landmarks, aspect))
+    assert restored_aspect == aspect
+    assert np.array_equal(restored, landmarks)
+
+
+def test_sqlite_cache_round_trip(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"), max_entries=8, max_bytes=1 << 20, ttl=60)
+    landmarks = np.random.default_rng(1).random((2, 478, 3), dtype=np.float32)
+    cache.put(b"key", landmarks, 4 / 3)
+    restored, aspect = cache.get(b"key")
+    assert aspect == 4 / 3
+    assert np.array_equal(restored, landmarks)
@@ -0,0 +1,70 @@
+# tests/test_video_stream.py
+# /ws/video 연결 수 제한(1013)과 분석 중 연결이 끊겼을 때 그래프를 닫는 순서 확인
+#
+# 실행 (저장소 루트에서): python -m pytest tests
+import asyncio
+import threading
+
+import pytest
+
+import Main
+import settings
+from video_stream import VideoSession
+
+
+def test_over_limit_connection_gets_1013(monkeypatch):
+    monkeypatch.setitem(Main.video_connections, "active", settings.VIDEO_MAX_CONNECTIONS)
+    sent = []
+
+    async def receive():
+        return {"type": "websocket.connect"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "websocket", "asgi": {"version": "3.0"}, "scheme": "ws", "path": "/ws/video", "raw_path": b"/ws/video",
+        "query_string": b"", "headers": [], "client": ("test", 1), "server": ("test", 80), "subprotocols": [],
+    }
+    asyncio.run(Main.app(scope, receive, send))
+    # accept 전에 닫으면 서버가 HTTP 403으로 거절하므로 accept 후 1013으로 닫아야 함
+    assert [message["type"] for message in sent] == ["websocket.accept", "websocket.close"]
+    assert sent[1]["code"] == 1013
+    assert Main.video_connections["active"] == settings.VIDEO_MAX_CONNECTIONS
+
+
+class SlowFaceMesh:
+    def __init__(self):
+        self.release = threading.Event()
+        self.running = False
+        self.closed_while_running = None
+
+    def process(self, contents):
+        self.running = True
+        self.release.wait(5)
+        self.running = False
+
+    def close(self):
+        self.closed_while_running = self.running
+
+
+def test_close_waits_for_running_frame():
+    session = VideoSession.__new__(VideoSession)
+    session.face_mesh = SlowFaceMesh()
+    session._running = None
+    session.process = session.face_mesh.process
+
+    async def scenario():
+        handler = asyncio.create_task(session.analyze(b"frame"))
+        await asyncio.sleep(0.05)
+        # 분석 중에 연결 처리 코루틴이 취소됨
+        handler.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await handler
+        session.close()
+        assert session.face_mesh.closed_while_running is None
+        session.face_mesh.release.set()
+        await asyncio.sleep(0.1)
+
+    asyncio.run(scenario())
+    assert session.face_mesh.closed_while_running is False
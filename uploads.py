@@ -0,0 +1,130 @@
+# uploads.py
+# 업로드 크기 제한을 본문 전체를 버퍼링하기 전에 적용
+import json
+
+from starlette.concurrency import run_in_threadpool
+
+# 한 번에 읽는 청크 크기
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+# multipart 경계/헤더/폼 필드 등 파일 외 본문 크기 여유분
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class UploadLimitMiddleware:
+    """경로별 요청 본문 크기 제한 (ASGI 미들웨어)
+
+    Content-Length가 제한을 넘으면 본문을 읽기 전에 바로 413을 반환하고,
+    Content-Length가 없거나 거짓인 경우에도 받은 양이 제한을 넘는 순간 읽기를 중단함
+    """
+
+    def __init__(self, app, limits):
+        self.app = app
+        self.limits = limits  # 경로 -> 최대 본문 크기 (바이트)
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            await self._reject(send, limit)
+            return
+
+        received = 0
+        exceeded = False
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            if exceeded:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # 앱에는 연결이 끊긴 것처럼 알려 더 이상 본문을 쌓지 않게 함
+                    exceeded = True
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message):
+            nonlocal response_started
+            if exceeded:
+                # 앱이 만든 응답(본문 파싱 오류 등) 대신 413을 보냄
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not exceeded:
+                raise
+        if exceeded and not response_started:
+            await self._reject(send, limit)
+
+    @staticmethod
+    async def _reject(send, limit):
+        megabytes = limit // (1024 * 1024)
+        body = json.dumps(
+            {"success": False, "error": f"업로드 크기는 {megabytes}MB 이하여야 합니다."},
+            ensure_ascii=False
+        ).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def _read_into(fileobj, view, size):
+    """파일 내용을 view에 청크 단위로 채우고 읽은 바이트 수 반환"""
+    length = 0
+    while length < size:
+        read = fileobj.readinto(view[length:length + UPLOAD_CHUNK_BYTES])
+        if not read:
+            break
+        length += read
+    return length
+
+
+async def read_upload(file, limit):
+    """UploadFile을 미리 할당한 버퍼에 청크 단위로 읽어 memoryview로 반환, 제한 초과 시 None
+
+    반환값은 복사 없이 np.frombuffer / cv2.imdecode에 바로 넘길 수 있음
+    """
+    size = file.size
+    if size is None:
+        # 크기를 모르는 경우: 청크를 읽으면서 제한 초과 시 즉시 중단
+        chunks = []
+        total = 0
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_BYTES)
+            if not chunk:
+                break
+            total += len(chunk)
+            if total > limit:
+                return None
+            chunks.append(chunk)
+        return memoryview(b"".join(chunks))
+
+    if size > limit:
+        return None
+
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    await file.seek(0)
+    # UploadFile.read와 같은 기준: 메모리에 있으면 바로 읽고, 디스크로 넘어간 파일은 스레드에서 읽음
+    if getattr(file, "_in_memory", False):
+        length = _read_into(file.file, view, size)
+    else:
+        length = await run_in_threadpool(_read_into, file.file, view, size)
+    return view[:length]
@@ -0,0 +1,115 @@
+# video_stream.py
+# 웹캠 프레임 스트림 분석 (연결마다 추적 모드 FaceMesh, 측정값 이동 평균, 처리보다 빨리 들어온 프레임은 버림)
+import asyncio
+import collections
+
+import numpy as np
+
+from face_mesh_pool import create_face_mesh
+from image_decode import decode_image
+from inference_pool import ImageDecodeError
+from landmark_geometry import MIN_LANDMARKS, bucket_features, feature_vectors, landmarks_to_array, measure_faces
+
+
+class FrameSlot:
+    """가장 최근 프레임 1장만 보관 (분석 중에 새 프레임이 오면 이전 프레임은 버림)"""
+
+    def __init__(self):
+        self._frame = None
+        self._event = asyncio.Event()
+        self.closed = False
+        self.received = 0
+        self.dropped = 0
+
+    def put(self, frame):
+        if self._frame is not None:
+            self.dropped += 1
+        self._frame = frame
+        self.received += 1
+        self._event.set()
+
+    def close(self):
+        self.closed = True
+        self._event.set()
+
+    async def get(self):
+        """다음 프레임 (연결이 끊겼으면 None)"""
+        while self._frame is None and not self.closed:
+            self._event.clear()
+            await self._event.wait()
+        if self.closed:
+            return None
+        frame, self._frame = self._frame, None
+        return frame
+
+
+class VideoSession:
+    """연결 1개의 영상 분석 상태 (process는 한 번에 하나씩만 호출)"""
+
+    def __init__(self, window, max_side, normalize=False, refine_landmarks=True):
+        # 추적 모드: 이전 프레임의 얼굴 위치에서 랜드마크를 이어서 계산 (얼굴을 놓쳤을 때만 검출기 실행)
+        self.face_mesh = create_face_mesh(1, refine_landmarks, static_image_mode=False)
+        self.max_side = max_side
+        self.normalize = normalize
+        self._window = collections.deque(maxlen=max(1, window))
+        self._running = None  # 워커 스레드에서 분석 중인 프레임
+
+    async def analyze(self, contents):
+        """process를 워커 스레드에서 실행 (기다리던 쪽이 취소되어도 스레드 작업은 끝까지 실행되고 close가 이를 기다림)"""
+        self._running = asyncio.ensure_future(asyncio.to_thread(self.process, contents))
+        return await asyncio.shield(self._running)
+
+    def process(self, contents):
+        """JPEG 프레임 → 최근 프레임 평균 측정값으로 분류한 (특징, 연속 특징 벡터), 얼굴이 없으면 None
+
+        디코딩 실패 시 ImageDecodeError (워커 스레드에서 실행)
+        """
+        import cv2
+
+        image = decode_image(contents, self.max_side)
+        if image is None:
+            raise ImageDecodeError()
+        rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        results = self.face_mesh.process(rgb_image)
+        if not results.multi_face_landmarks:
+            # 얼굴을 놓치면 평균을 새로 시작 (다른 사람이 들어와도 이전 얼굴 값이 섞이지 않도록)
+            self._window.clear()
+            return None
+
+        points = landmarks_to_array(results.multi_face_landmarks[0].landmark)
+        if len(points) < MIN_LANDMARKS:
+            return None
+        self._window.append(measure_faces(points[None], self.normalize, image.shape[1] / image.shape[0])[0])
+        smoothed = np.mean(self._window, axis=0)[None]
+        return bucket_features(smoothed)[0], feature_vectors(smoothed)[0]
+
+    def close(self):
+        """그래프 닫기 (분석 중인 프레임이 있으면 끝난 뒤에 닫음)"""
+        if self._running is not None and not self._running.done():
+            self._running.add_done_callback(self._close_after)
+        else:
+            self.face_mesh.close()
+
+    def _close_after(self, running):
+        if not running.cancelled():
+            running.exception()  # 연결이 끊긴 뒤의 실패는 무시
+        self.face_mesh.close()
+
+
+async def receive_frames(websocket, slot, max_frame_bytes):
+    """클라이언트가 보낸 바이너리 프레임을 slot에 넣음 (연결 종료/너무 큰 프레임이면 slot을 닫고 끝남)"""
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            frame = message.get("bytes")
+            if not frame:
+                # 텍스트 메시지(ping 등)는 무시
+                continue
+            if len(frame) > max_frame_bytes:
+                await websocket.close(code=1009)
+                return
+            slot.put(frame)
+    finally:
+        slot.close()